@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Okul video indirici için çevrimdışı performans ölçümü
+Yerel bir BigBlueButton benzeri sunucu başlatır ve keşif / indirme
+adımlarını okulun sunucusuna gitmeden ölçer
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import download_video as dv
+
+# Yerel sunucu ayarları
+RECORDING_ID = '0' * 36 + 'b3e7-1759406163000'  # Standart BBB kayıt kimliği biçiminde
+MEDIA_BLOCK_SIZE = 1024 * 1024       # Sentetik medya içeriğinin tekrar eden blok boyutu
+SEND_CHUNK_SIZE = 64 * 1024          # Sunucunun tek seferde yazdığı en fazla byte
+HTML_PADDING = 256 * 1024            # Oynatıcı sayfasına eklenen betik dolgusu (regex taraması için)
+
+# Senaryolar: gecikme (istek başına saniye), bağlantı başına bant genişliği
+# (byte/s, None = sınırsız), bağlantı kopma olasılığı, medya isteğine
+# unsupportedRequest yanıtı verme olasılığı ve HEAD desteği
+SCENARIOS = {
+    'fast': {'latency': 0.0, 'bandwidth': None, 'drop_rate': 0.0, 'unsupported_rate': 0.0, 'head': True},
+    'wan': {'latency': 0.04, 'bandwidth': 20 * 1024 * 1024, 'drop_rate': 0.0, 'unsupported_rate': 0.0,
+            'head': True},
+    'flaky': {'latency': 0.02, 'bandwidth': 40 * 1024 * 1024, 'drop_rate': 0.25, 'unsupported_rate': 0.0,
+              'head': True},
+    'nohead': {'latency': 0.02, 'bandwidth': None, 'drop_rate': 0.0, 'unsupported_rate': 0.0, 'head': False},
+}
+
+# Ölçüm ayarları
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+DEFAULT_MEDIA_SIZE = 32 * 1024 * 1024
+REGRESSION_THRESHOLD = 0.10          # Temel ölçüme göre %10'dan fazla yavaşlama gerileme sayılır
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.benchmarks')
+CASES = ('discovery_resolver', 'discovery_html', 'download_file', 'download_all')
+
+UNSUPPORTED_XML = (
+    b'<response><returncode>FAILED</returncode><messageKey>unsupportedRequest</messageKey>'
+    b'<message>This request is not supported.</message></response>'
+)
+
+
+class SyntheticMedia:
+    """Bellekte tutulmadan üretilen, kapsayıcı kontrolünden geçen medya içeriği
+
+    Başlık (WebM için EBML + Segment, Ogg için OggS) gerçek biçime uygundur;
+    gövde, tohumdan üretilen bir bloğun tekrarıdır.
+    """
+
+    def __init__(self, kind, size, seed):
+        self.size = size
+        self.content_type = 'audio/ogg' if kind == 'audio' else 'video/webm'
+        self.etag = f'"{kind}-{size}-{seed}"'
+        self._block = random.Random(seed).getrandbits(8 * MEDIA_BLOCK_SIZE).to_bytes(MEDIA_BLOCK_SIZE, 'little')
+        if kind == 'audio':
+            self._header = b'OggS'
+        else:
+            ebml = b'\x1a\x45\xdf\xa3' + bytes([0x80 | 7]) + b'\x42\x82\x84webm'
+            segment_size = size - len(ebml) - 12
+            self._header = ebml + b'\x18\x53\x80\x67' + ((0x01 << 56) | segment_size).to_bytes(8, 'big')
+
+    def read(self, start, stop):
+        """[start, stop) aralığındaki byte'lar"""
+        parts = []
+        if start < len(self._header):
+            parts.append(self._header[start:stop])
+            start = min(stop, len(self._header))
+        while start < stop:
+            offset = (start - len(self._header)) % MEDIA_BLOCK_SIZE
+            piece = self._block[offset:offset + (stop - start)]
+            parts.append(piece)
+            start += len(piece)
+        return b''.join(parts)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """BBB playback sunucusu gibi davranan istek işleyici"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._handle(head=True)
+
+    def do_GET(self):
+        self._handle(head=False)
+
+    def _send(self, status, body, content_type, head, headers=()):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _handle(self, head):
+        server = self.server
+        config = server.config
+        server.count('requests')
+        if config['latency']:
+            time.sleep(config['latency'])
+        if head and not config['head']:
+            server.count('head_rejected')
+            return self._send(405, b'', 'text/plain', head)
+
+        path = urlparse(self.path).path
+        page = server.pages.get(path.rstrip('/'))
+        if page is not None:
+            body, content_type = page
+            return self._send(200, body, content_type, head)
+
+        media = server.media.get(path)
+        if media is None or server.chance('unsupported_rate'):
+            # BBB desteklenmeyen istekler için 200 ile XML hata gövdesi döndürür
+            server.count('unsupported')
+            return self._send(200, UNSUPPORTED_XML, 'text/xml', head)
+        self._send_media(media, head)
+
+    def _send_media(self, media, head):
+        server = self.server
+        start, stop = 0, media.size
+        status = 200
+        range_header = self.headers.get('Range', '')
+        if_range = self.headers.get('If-Range')
+        if range_header.startswith('bytes=') and if_range in (None, media.etag):
+            first, _, last = range_header[6:].partition('-')
+            start = int(first)
+            stop = min(int(last) + 1, media.size) if last else media.size
+            status = 206
+
+        self.send_response(status)
+        self.send_header('Content-Type', media.content_type)
+        self.send_header('Content-Length', str(stop - start))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', media.etag)
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{stop - 1}/{media.size}')
+        self.end_headers()
+        if head:
+            return
+
+        drop_at = start + server.randint(0, stop - start - 1) if server.chance('drop_rate') else None
+        bandwidth = server.config['bandwidth']
+        began = time.monotonic()
+        sent = 0
+        position = start
+        try:
+            while position < stop:
+                end = min(position + SEND_CHUNK_SIZE, stop)
+                if drop_at is not None and end > drop_at:
+                    self.wfile.write(media.read(position, drop_at))
+                    server.count('drops')
+                    self.close_connection = True
+                    self.connection.shutdown(socket.SHUT_RDWR)
+                    return
+                self.wfile.write(media.read(position, end))
+                sent += end - position
+                position = end
+                if bandwidth:
+                    delay = sent / bandwidth - (time.monotonic() - began)
+                    if delay > 0:
+                        time.sleep(delay)
+            server.count('bytes_sent', sent)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class StandInServer(socketserver.ThreadingMixIn, HTTPServer):
+    """Tek kayıtlık yerel BBB sunucusu (playback sayfası, metadata, medya)
+
+    `with StandInServer(config) as server:` ile arka planda çalışır;
+    `server.playback_url` indiriciye verilecek adrestir.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, config, media_size=DEFAULT_MEDIA_SIZE, recording_id=RECORDING_ID, seed=0):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.config = dict(config)
+        self.recording_id = recording_id
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.stats = {}
+
+        base = f'/presentation/{recording_id}'
+        self.media = {
+            f'{base}/video/webcams.webm': SyntheticMedia('video', media_size, seed + 1),
+            f'{base}/deskshare/deskshare.webm': SyntheticMedia('video', media_size // 2, seed + 2),
+            f'{base}/audio/audio.ogg': SyntheticMedia('audio', max(4096, media_size // 8), seed + 3),
+        }
+        self.pages = {
+            f'/playback/presentation/2.3/{recording_id}': (self._playback_html(base), 'text/html; charset=utf-8'),
+            f'{base}/metadata.xml': (self._metadata_xml(), 'text/xml'),
+            f'{base}/shapes.svg': (self._shapes_svg(base), 'image/svg+xml'),
+        }
+
+    def _playback_html(self, base):
+        padding = ''.join(f'var s{i}="{"x" * 60}";\n' for i in range(HTML_PADDING // 72))
+        return (
+            '<!DOCTYPE html><html><head><title>Playback</title>'
+            '<link rel="stylesheet" href="/playback/presentation/2.3/static/css/main.css">'
+            f'<script>{padding}</script></head><body>'
+            f'<video id="webcams" src="{base}/video/webcams.webm"></video>'
+            f'<video id="deskshare"><source src="{base}/deskshare/deskshare.webm" type="video/webm"></video>'
+            f'<audio src="{base}/audio/audio.ogg"></audio>'
+            '</body></html>'
+        ).encode('utf-8')
+
+    def _metadata_xml(self):
+        return (
+            f'<recording><id>{self.recording_id}</id><state>published</state>'
+            f'<start_time>{self.recording_id.rsplit("-", 1)[1]}</start_time>'
+            '<meta><meetingName>Performans ölçümü</meetingName></meta></recording>'
+        ).encode('utf-8')
+
+    def _shapes_svg(self, base):
+        slides = ''.join(
+            f'<image id="image{i}" xlink:href="presentation/slide-{i}.png" in="{i * 10}" out="{i * 10 + 10}"/>'
+            for i in range(1, 200)
+        )
+        return f'<svg xmlns:xlink="http://www.w3.org/1999/xlink">{slides}</svg>'.encode('utf-8')
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    @property
+    def playback_url(self):
+        return f'{self.base_url}/playback/presentation/2.3/{self.recording_id}'
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + n
+
+    def chance(self, key):
+        rate = self.config.get(key) or 0
+        with self._lock:
+            return rate > 0 and self._rng.random() < rate
+
+    def randint(self, low, high):
+        with self._lock:
+            return self._rng.randint(low, max(low, high))
+
+    def take_stats(self):
+        """Sayaçları döndür ve sıfırla"""
+        with self._lock:
+            stats, self.stats = self.stats, {}
+        return stats
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, name='stand-in', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def percentile(values, p):
+    """Sıralı değerlerde en yakın sıra yöntemiyle yüzdelik"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(samples):
+    """Bir ölçümün tekrarlarından süre yüzdelikleri ve aktarım hızı"""
+    times = [s['seconds'] for s in samples if s['ok']]
+    summary = {
+        'runs': len(samples),
+        'ok': len(times),
+        'p50': percentile(times, 50),
+        'p90': percentile(times, 90),
+        'p99': percentile(times, 99),
+        'mean': sum(times) / len(times) if times else None,
+        'min': min(times) if times else None,
+        'max': max(times) if times else None,
+    }
+    rates = [s['bytes'] / s['seconds'] for s in samples if s['ok'] and s['bytes'] and s['seconds'] > 0]
+    summary['throughput_p50'] = percentile(rates, 50)
+
+    # Aşama sürelerinin ortancası: yavaşlayan adımı bulmak için
+    phases = {}
+    for sample in samples:
+        for name, phase in sample['phases'].items():
+            phases.setdefault(name, []).append(phase['seconds'])
+    summary['phases'] = {name: round(percentile(values, 50), 4) for name, values in sorted(phases.items())}
+    summary['server'] = samples[-1]['server'] if samples else {}
+    return {key: round(value, 4) if isinstance(value, float) else value for key, value in summary.items()}
+
+
+class Bench:
+    """Ölçüm durumunu (sunucu, geçici dizin, indirici ayarları) bir arada tutar"""
+
+    def __init__(self, server, workdir, connections):
+        self.server = server
+        self.workdir = workdir
+        self.connections = connections
+        self.progress = dv.ProgressReporter(stream=io.StringIO())
+
+    def downloader(self, metrics, **kwargs):
+        return dv.VideoDownloader(self.server.playback_url, connections=self.connections, use_cache=False,
+                                  use_browser=False, progress=self.progress, metrics=metrics, **kwargs)
+
+    def output_dir(self):
+        path = tempfile.mkdtemp(prefix='run-', dir=self.workdir)
+        return path
+
+    def discovery_resolver(self, metrics):
+        video_urls, audio_urls = self.downloader(metrics, discovery='resolver').get_presentation_data()
+        return len(video_urls) + len(audio_urls) == len(self.server.media), 0
+
+    def discovery_html(self, metrics):
+        video_urls, audio_urls = self.downloader(metrics, discovery='html').get_presentation_data()
+        return bool(video_urls) and bool(audio_urls), 0
+
+    def download_file(self, metrics):
+        path, media = next(iter(self.server.media.items()))
+        output_dir = self.output_dir()
+        try:
+            ok = self.downloader(metrics).download_file(self.server.base_url + path,
+                                                        os.path.join(output_dir, 'webcams.webm'))
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        return ok, media.size
+
+    def download_all(self, metrics):
+        output_dir = self.output_dir()
+        try:
+            result = self.downloader(metrics, discovery='resolver').download_all(output_dir)
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        return result['status'] == 'ok', sum(media.size for media in self.server.media.values())
+
+
+def reset_process_caches():
+    """Yoklama sonuçları gibi süreç içi önbellekleri temizle (her tekrar soğuk başlar)"""
+    with dv._probe_cache_lock:
+        dv._probe_cache.clear()
+    dv._no_head_hosts.clear()
+
+
+def run_case(bench, name, repeat, warmup):
+    """Bir ölçümü ısınma + tekrar sayısı kadar çalıştır"""
+    samples = []
+    for i in range(warmup + repeat):
+        reset_process_caches()
+        bench.server.take_stats()
+        metrics = dv.Metrics()
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                ok, nbytes = getattr(bench, name)(metrics)
+            except Exception:
+                ok, nbytes = False, 0
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            samples.append({
+                'seconds': elapsed,
+                'ok': bool(ok),
+                'bytes': nbytes,
+                'phases': metrics.report()['phases'],
+                'server': bench.server.take_stats(),
+            })
+    return summarize(samples)
+
+
+def format_seconds(value):
+    if value is None:
+        return '-'
+    return f"{value * 1000:.0f}ms" if value < 1 else f"{value:.2f}s"
+
+
+def print_results(results):
+    print(f"\n{'Ölçüm':<20} {'ok':>5} {'p50':>9} {'p90':>9} {'p99':>9} {'hız (p50)':>12}")
+    print("-" * 68)
+    for name, r in results['cases'].items():
+        rate = f"{dv.format_bytes(r['throughput_p50'])}/s" if r['throughput_p50'] else '-'
+        print(f"{name:<20} {r['ok']:>2}/{r['runs']:<2} {format_seconds(r['p50']):>9} "
+              f"{format_seconds(r['p90']):>9} {format_seconds(r['p99']):>9} {rate:>12}")
+
+
+def compare_with_baseline(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Temel ölçümle karşılaştır; gerileyen ölçümlerin listesini döndür"""
+    regressions = []
+    print(f"\n📏 Temel ölçümle karşılaştırma ({baseline.get('created', '?')}, eşik %{threshold * 100:.0f})")
+    for name, current in results['cases'].items():
+        base = baseline.get('cases', {}).get(name)
+        if not base or not base.get('p50') or not current.get('p50'):
+            continue
+        change = current['p50'] / base['p50'] - 1
+        slower = change > threshold or current['ok'] < current['runs'] and base['ok'] == base['runs']
+        icon = '❌' if slower else '✓'
+        print(f"{icon} {name:<20} p50 {format_seconds(base['p50'])} → {format_seconds(current['p50'])} "
+              f"({change * 100:+.1f}%)")
+        if slower:
+            regressions.append(name)
+            # Hangi aşamanın yavaşladığını göster
+            for phase, seconds in current['phases'].items():
+                before = base.get('phases', {}).get(phase)
+                if before and seconds > before * (1 + threshold) and seconds - before > 0.001:
+                    print(f"     {phase}: {format_seconds(before)} → {format_seconds(seconds)}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='benchmark.py',
+        description='Yerel BBB benzeri sunucuyla keşif ve indirme performansını ölçer.',
+    )
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='fast', help='ağ senaryosu')
+    parser.add_argument('--cases', default=','.join(CASES),
+                        help=f'virgülle ayrılmış ölçümler (varsayılan: hepsi: {",".join(CASES)})')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='ölçüm başına tekrar')
+    parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP, help='sayılmayan ısınma turu')
+    parser.add_argument('--size', type=dv.parse_rate, default=DEFAULT_MEDIA_SIZE,
+                        help='webcams.webm boyutu, ör. 64M (deskshare yarısı, ses sekizde biri)')
+    parser.add_argument('-c', '--connections', type=int, default=dv.DEFAULT_CONNECTIONS,
+                        help='dosya başına paralel bağlantı')
+    parser.add_argument('--latency', type=float, help='senaryonun istek gecikmesini değiştir (saniye)')
+    parser.add_argument('--bandwidth', type=dv.parse_rate, help='bağlantı başına bant genişliği, ör. 10M')
+    parser.add_argument('--drop-rate', type=float, help='medya yanıtında bağlantı kopma olasılığı (0-1)')
+    parser.add_argument('--unsupported-rate', type=float,
+                        help='medya isteğine unsupportedRequest yanıtı verme olasılığı (0-1)')
+    parser.add_argument('--baseline', help='temel ölçüm dosyası (varsayılan: .benchmarks/<senaryo>.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='sonuçları temel ölçüm olarak kaydet')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='gerileme eşiği (0.10 = %%10)')
+    parser.add_argument('--json', metavar='DOSYA', help='sonuçları JSON olarak yaz')
+    parser.add_argument('--serve', action='store_true', help='yalnızca yerel sunucuyu başlat (Ctrl+C ile dur)')
+    args = parser.parse_args(argv)
+
+    config = dict(SCENARIOS[args.scenario])
+    for key in ('latency', 'bandwidth', 'drop_rate', 'unsupported_rate'):
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+    cases = [name.strip() for name in args.cases.split(',') if name.strip()]
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        parser.error(f"bilinmeyen ölçüm: {', '.join(unknown)}")
+
+    with StandInServer(config, media_size=args.size) as server:
+        if args.serve:
+            print(f"🖥  Yerel BBB sunucusu: {server.playback_url}")
+            print(f"   Senaryo: {args.scenario} {config}")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                return 0
+
+        print("=" * 60)
+        print(f"⏱  Performans ölçümü - senaryo: {args.scenario}, tekrar: {args.repeat}, "
+              f"boyut: {dv.format_bytes(args.size)}, bağlantı: {args.connections}")
+        print("=" * 60)
+
+        workdir = tempfile.mkdtemp(prefix='okul-video-bench-')
+        try:
+            bench = Bench(server, workdir, args.connections)
+            results = {
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'scenario': args.scenario,
+                'config': config,
+                'media_size': args.size,
+                'connections': args.connections,
+                'repeat': args.repeat,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cases': {},
+            }
+            for name in cases:
+                print(f"▶ {name}...")
+                results['cases'][name] = run_case(bench, name, args.repeat, args.warmup)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Sonuçlar kaydedildi: {args.json}")
+
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f'{args.scenario}.json')
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 Temel ölçüm kaydedildi: {baseline_path}")
+        return 0
+    if os.path.exists(baseline_path):
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            regressions = compare_with_baseline(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n❌ Gerileme: {', '.join(regressions)}")
+            return 1
+        print("\n✓ Gerileme yok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,54 +9,1849 @@ import os
 import json
 import re
 from urllib.parse import urljoin, urlparse
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.cookies import create_cookie, extract_cookies_to_jar
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+from http.client import HTTPMessage
 from pathlib import Path
 import sys
 import time
+import argparse
+import codecs
+import cProfile
+import functools
+import hashlib
+import importlib
+import importlib.util
+import io
+import pstats
+import queue
+import shutil
+import signal
+import sqlite3
+import subprocess
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+# Opsiyonel bağımlılıklar (selenium, httpx) ilk kullanımda yüklenir; cron gibi
+# kısa çalıştırmalarda tarayıcı gerekmiyorsa başlangıç süresine eklenmez
+_optional_modules = {}
+
+
+def optional_import(name):
+    """Opsiyonel modülü ilk kullanımda içe aktar; kurulu değilse None"""
+    if name not in _optional_modules:
+        try:
+            _optional_modules[name] = importlib.import_module(name)
+        except ImportError:
+            _optional_modules[name] = None
+    return _optional_modules[name]
+
+
+def selenium_available():
+    """Selenium kurulu mu? (modül yüklenmeden kontrol edilir)"""
+    return importlib.util.find_spec('selenium') is not None
+
+# Selenium ağ yakalama ayarları
+SELENIUM_CAPTURE_DEADLINE = 15      # Medya akışları için en fazla bekleme (saniye)
+SELENIUM_SETTLE_TIME = 1.0          # Son akıştan sonra ek akışlar için bekleme
+SELENIUM_POLL_INTERVAL = 0.25
+SELENIUM_BLOCKED_URLS = [           # Tarayıcıda yüklenmeyecek dosyalar
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*/slides/*', '*/thumbnails/*', '*/presentation/*/cursor.xml',
+]
+BROWSER_MAX_USES = 20               # Havuzdaki tarayıcı bu kadar kullanımdan sonra yenilenir
+
+# Parçalı (çoklu bağlantılı) indirme ayarları
+DEFAULT_CONNECTIONS = 4              # Aynı dosya için paralel bağlantı sayısı
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024   # Bu boyuttan küçük parçalara bölünmez
+SEGMENT_RETRIES = 3                  # Başarısız parça için tekrar deneme sayısı
+CHUNK_SIZE = 64 * 1024
+
+# Bütünlük doğrulama ayarları
+HASH_ALGORITHM = 'sha256'            # 'sha256' veya daha hızlı 'blake2b'
+HASH_CATCHUP_STEP = 4 * 1024 * 1024  # Parçalı indirmede diskten okunarak özetlenen en fazla blok
+INTEGRITY_SUFFIX = '.integrity.json'
+
+# İçerik adresli depo ve dosya adlandırma
+BLOB_DIR_NAME = '.blobs'             # Çıktı dizini altında özetle adreslenen dosya deposu
+# Kullanılabilir alanlar: {recording_id} {meeting_id} {date} {time} {kind} {index} {name} {stem} {ext}
+NAME_TEMPLATE = '{date}_{recording_id}_{name}'
+
+# Video ve sesi tek dosyada birleştirme (ffmpeg, yeniden kodlama yok)
+FFMPEG_BINARY = 'ffmpeg'
+MUX_FORMAT = 'mkv'                   # 'mkv' her codec'i kabul eder; 'mp4' yalnızca MP4 uyumlu codec'lerde
+MUX_PROCESSES = max(1, (os.cpu_count() or 2) // 2)  # Aynı anda çalışan en fazla ffmpeg süreci
+# Baştan sona akış halinde okunabilen kapsayıcılar; diğerleri (ör. mp4) önce diske indirilir
+STREAMABLE_EXTENSIONS = ('.webm', '.mkv', '.ogg', '.opus', '.mp3')
+
+# İlerleme göstergesi ayarları
+PROGRESS_INTERVAL = 0.5              # Terminalde ilerleme satırı yenileme aralığı (saniye)
+PROGRESS_LOG_INTERVAL = 30           # Terminal değilse (cron, log) satır yazma aralığı
+PROGRESS_JSON_INTERVAL = 1           # --progress-json-fd ilerleme olayı aralığı (terminalden bağımsız)
+
+# Ölçüm (metrik) ayarları
+METRICS_FILENAME = 'metrics.json'    # Her çalıştırmanın ölçüm raporu (çıktı dizininde)
+METRICS_PREFIX = 'okul_video'        # Prometheus metrik adı öneki
+PROFILE_TOP = 25                     # cProfile özetinde gösterilen fonksiyon sayısı
+
+# Bant genişliği ve aktarım sırası
+BANDWIDTH_LIMIT = None               # Tüm bağlantılar için toplam sınır (byte/s), None = sınırsız
+BANDWIDTH_FILE_POLL = 2              # --bw-limit-file değişikliklerini kontrol aralığı (saniye)
+DEFAULT_TRANSFERS = 2                # Aynı anda çalışan dosya aktarımı sayısı
+KIND_PRIORITY = {'audio': 0, 'video': 1}  # Küçük değer önce indirilir
+
+# Toplu (batch) indirme ayarları
+DEFAULT_BATCH_WORKERS = 3            # Aynı anda işlenen kayıt sayısı
+DEFAULT_HOST_CONNECTIONS = 8         # Sunucu başına en fazla açık bağlantı
+
+# Aday dosya yoklama ayarları
+PROBE_WORKERS = 8                    # Aynı anda yoklanan aday sayısı
+
+# Ağ katmanı: aşama başına (bağlantı, okuma) zaman aşımları ve tekrar deneme
+TIMEOUTS = {
+    'login': (5, 15),
+    'discovery': (5, 20),
+    'probe': (3, 10),
+    'transfer': (10, 60),
+}
+RETRY_TOTAL = 5                      # Bağlantı hatası / geçici yanıt için en fazla tekrar
+RETRY_BACKOFF = 0.5                  # Üstel bekleme çarpanı: 0.5, 1, 2, 4 ... saniye
+RETRY_STATUSES = (429, 500, 502, 503, 504)  # Tekrar denenecek durum kodları (Retry-After dikkate alınır)
+RETRY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})  # Yalnızca idempotent istekler tekrarlanır
+TRANSPORT_BACKEND = 'requests'       # 'requests' (HTTP/1.1) veya 'httpx' (HTTP/2, opsiyonel)
+
+# Sunucu profilleri: doğrudan yoklanacak aday yollar.
+# Anahtar sunucu adı (host), bulunamazsa 'default' kullanılır.
+# Yollarda {recording_id} yer tutucusu kullanılabilir.
+SERVER_PROFILES = {
+    'default': {
+        'video_paths': [
+            '/presentation/video.webm',
+            '/presentation/video.mp4',
+            '/presentation/deskshare.webm',
+            '/presentation/deskshare.mp4',
+            '/presentation/camera.webm',
+            '/presentation/camera.mp4',
+        ],
+        'audio_paths': [
+            '/presentation/audio.ogg',
+            '/presentation/audio.mp3',
+            '/presentation/audio.webm',
+        ],
+        # BigBlueButton'un standart kayıt dizini (tarayıcısız çözümleyici)
+        'recording_video_paths': [
+            '/presentation/{recording_id}/video/webcams.webm',
+            '/presentation/{recording_id}/video/webcams.mp4',
+            '/presentation/{recording_id}/deskshare/deskshare.webm',
+            '/presentation/{recording_id}/deskshare/deskshare.mp4',
+        ],
+        'recording_audio_paths': [
+            '/presentation/{recording_id}/audio/audio.ogg',
+            '/presentation/{recording_id}/audio/audio.webm',
+        ],
+        'recording_meta_paths': [
+            '/presentation/{recording_id}/metadata.xml',
+            '/presentation/{recording_id}/shapes.svg',
+        ],
+    },
+}
+
+# Keşif stratejileri (varsayılan deneme sırası); ilk sonuç veren kullanılır
+DISCOVERY_STRATEGIES = ('resolver', 'selenium', 'html')
+DEBUG_HTML_FILENAME = 'page_source.html'  # --save-html ile kaydedilen oynatıcı sayfası
+
+# Kalıcı keşif önbelleği
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'okul-video-indirici')
+DISCOVERY_CACHE_TTL = 7 * 24 * 3600   # Bu süreden eski kayıtlar yeniden keşfedilir
+DISCOVERY_CACHE_MAX_ENTRIES = 5000    # Aşılınca en az kullanılanlar silinir (LRU)
+
+# Kalıcı oturum (çerez) önbelleği; dosya yalnızca kullanıcı tarafından okunabilir (0600)
+SESSION_CACHE_FILE = os.path.join(CACHE_DIR, 'sessions.json')
+SESSION_CACHE_MAX_AGE = 30 * 24 * 3600  # Bu süreden eski oturumlar hiç denenmez
+LOGIN_PATHS = ['/login', '/login.php', '/index.php/login']
+PASSWORD_FIELD_RE = re.compile(r'<input[^>]+type\s*=\s*["\']?password', re.IGNORECASE)
+
+# /playback/presentation/2.3/<meetingId-timestamp>
+PLAYBACK_URL_RE = re.compile(r'/playback/presentation/[^/]+/([0-9A-Za-z]+-\d+)/?$')
+
+# Yoklama sonuçları: (kayıt_id, url) -> dosya bilgisi veya None.
+# Toplu modda kayıtlar arasında paylaşılır.
+_probe_cache = {}
+_probe_cache_lock = threading.Lock()
+
+# HEAD isteğini desteklemediği görülen sunucular
+_no_head_hosts = set()
+
+
+def parse_recording_id(url):
+    """Standart BBB playback URL'inden kayıt kimliğini çıkar, değilse None"""
+    match = PLAYBACK_URL_RE.search(urlparse(url).path)
+    return match.group(1) if match else None
+
+
+def recording_start_time(recording_id):
+    """Kayıt kimliğinin zaman damgası kısmından başlangıç zamanını çıkar (yerel saat)"""
+    match = re.search(r'-(\d{13})$', recording_id or '')
+    if not match:
+        return None
+    return time.localtime(int(match.group(1)) / 1000)
+
+
+def format_output_name(template, recording_id, kind, index, name):
+    """Şablondan çıktı dosya adını oluştur"""
+    started = recording_start_time(recording_id)
+    stem, ext = os.path.splitext(name)
+    return template.format(
+        recording_id=recording_id,
+        meeting_id=recording_id.rsplit('-', 1)[0],
+        date=time.strftime('%Y-%m-%d', started) if started else 'tarihsiz',
+        time=time.strftime('%H-%M', started) if started else 'tarihsiz',
+        kind=kind,
+        index=index,
+        name=name,
+        stem=stem,
+        ext=ext.lstrip('.'),
+    )
+
+
+def recording_id_from_url(url):
+    """Playback URL'inden kayıt kimliğini (meetingId-timestamp) çıkar"""
+    recording_id = parse_recording_id(url)
+    if recording_id:
+        return recording_id
+    path = urlparse(url).path.rstrip('/')
+    return path.rsplit('/', 1)[-1] or urlparse(url).netloc
+
+
+class MediaURLExtractor:
+    """Oynatıcı HTML'i, metadata.xml ve shapes.svg içinden medya URL'lerini çıkar
+
+    Tek bir derlenmiş desen belgeyi bir kez tarar; her tırnaklı değer aynı
+    geçişte 'video', 'deskshare' veya 'audio' olarak sınıflandırılır.
+    Sonuçlar bulunma sırasını koruyarak tekrarsız tutulur. Girdi parça parça
+    (`feed`) verilebilir; parça sınırına denk gelen değerler için son
+    OVERLAP karakter bir sonraki parçaya taşınır.
+    
+    >>> extractor = MediaURLExtractor('https://okul.example')
+    >>> extractor.feed('{"video":"/presentation/abc/video/webcams"}').close().urls('video')
+    ['https://okul.example/presentation/abc/video/webcams']
+    """
+    
+    # İsteğe bağlı anahtar (src: / url: / "video": / href=) + tırnaklı değer;
+    # anahtarın tırnağı değerin açılış tırnağı sanılmasın diye anahtarla birlikte eşlenir
+    TOKEN_RE = re.compile(
+        r'(?:(?P<key_quote>["\']?)\b(?P<key>src|url|href|video|deskshare|audio|camera)(?P=key_quote)\s*[:=]\s*)?'
+        r'(?P<quote>["\'])(?P<value>[^"\'\s<>]{1,2048}?)(?P=quote)',
+        re.IGNORECASE
+    )
+    MEDIA_EXT_RE = re.compile(r'\.(?:webm|mp4|ogg|mp3|m4a)(?:[?#]|$)', re.IGNORECASE)
+    ANY_EXT_RE = re.compile(r'\.[a-z0-9]{1,5}(?:[?#]|$)', re.IGNORECASE)
+    KINDS = ('video', 'deskshare', 'audio')
+    OVERLAP = 4096
+    
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.found = {kind: {} for kind in self.KINDS}
+        self._buffer = ''
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    
+    def _resolve(self, value):
+        if value.startswith(('http://', 'https://')):
+            return value
+        if value.startswith('/'):
+            return urljoin(self.base_url, value)
+        return urljoin(self.base_url, '/' + value.lstrip('/'))
+    
+    def _classify(self, key, value):
+        """Değeri medya türüne göre sınıflandır, medya değilse None"""
+        lower = value.lower()
+        if not self.MEDIA_EXT_RE.search(lower):
+            # Uzantısız değerler yalnızca src/url gibi bir anahtarla ve yol olarak kabul edilir
+            if not key or '/' not in lower or self.ANY_EXT_RE.search(lower):
+                return None
+        if 'deskshare' in lower:
+            return 'deskshare'
+        if 'audio' in lower:
+            return 'audio'
+        if 'video' in lower or 'camera' in lower or 'webcams' in lower:
+            return 'video'
+        return None
+    
+    def _scan(self, final):
+        buffer = self._buffer
+        safe_end = len(buffer) if final else len(buffer) - self.OVERLAP
+        cut = max(0, safe_end)
+        for match in self.TOKEN_RE.finditer(buffer):
+            if match.end() > safe_end:
+                # Parça sınırındaki eşleşme bir sonraki taramaya kalır
+                cut = min(cut, match.start())
+                break
+            value = match.group('value')
+            kind = self._classify(match.group('key'), value)
+            if kind:
+                self.found[kind].setdefault(self._resolve(value), None)
+        self._buffer = '' if final else buffer[cut:]
+    
+    def feed(self, data):
+        """Belgenin bir sonraki parçasını işle (bytes veya str)"""
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+        self._buffer += data
+        if len(self._buffer) > 2 * self.OVERLAP:
+            self._scan(final=False)
+        return self
+    
+    def close(self):
+        """Belgenin sonu: kalan tamponu tara (sonraki belge için hazırlar)"""
+        self._buffer += self._decoder.decode(b'', final=True)
+        self._scan(final=True)
+        self._decoder.reset()
+        return self
+    
+    def urls(self, kind):
+        """Belirtilen türde bulunan URL'ler (bulunma sırasıyla)"""
+        return list(self.found[kind])
+
+
+class TransportStats:
+    """Oturum üzerinden yapılan istek, açılan bağlantı ve tekrar sayıları
+
+    Açılan bağlantı sayısı istek sayısından ne kadar azsa bağlantılar o
+    kadar yeniden kullanılmış demektir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.retries = 0
+
+    def request_done(self, retries=0):
+        with self._lock:
+            self.requests += 1
+            self.retries += retries
+
+    def connection_opened(self):
+        with self._lock:
+            self.connections += 1
+
+    def snapshot(self):
+        with self._lock:
+            reused = max(0, self.requests - self.connections)
+            return {
+                'requests': self.requests,
+                'connections_opened': self.connections,
+                'connections_reused': reused,
+                'reuse_ratio': round(reused / self.requests, 3) if self.requests else 0.0,
+                'retries': self.retries,
+            }
+
+    def summary(self):
+        snap = self.snapshot()
+        return (f"{snap['requests']} istek, {snap['connections_opened']} yeni bağlantı "
+                f"(%{snap['reuse_ratio'] * 100:.0f} yeniden kullanım), {snap['retries']} tekrar")
+
+
+def create_retry():
+    """Geçici hatalar için üstel beklemeli tekrar politikası
+
+    Yalnızca idempotent istekler tekrarlanır; 429/503 yanıtlarındaki
+    Retry-After başlığı beklemeye esas alınır.
+    """
+    return Retry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=2,
+        status=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=RETRY_METHODS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _counting_pool_class(pool_cls, stats):
+    """Yeni bağlantı açtıkça sayacı artıran bağlantı havuzu sınıfı"""
+
+    class CountingPool(pool_cls):
+        def _new_conn(self):
+            stats.connection_opened()
+            return super()._new_conn()
+
+    CountingPool.__name__ = 'Counting' + pool_cls.__name__
+    return CountingPool
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """Bağlantı yeniden kullanımını ve tekrarları sayan HTTPAdapter"""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: _counting_pool_class(pool_cls, self.stats)
+            for scheme, pool_cls in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        retries = getattr(response.raw, 'retries', None)
+        self.stats.request_done(len(retries.history) if retries is not None else 0)
+        return response
+
+
+class _HTTPXRaw:
+    """httpx yanıtını requests'in beklediği response.raw arayüzüne uyarlar"""
+
+    def __init__(self, response):
+        self._response = response
+        self._iter = None
+        self._buffer = b''
+        # Çerezlerin oturuma aktarılması için http.client biçiminde başlıklar
+        msg = HTTPMessage()
+        for key, value in response.headers.multi_items():
+            msg[key] = value
+        self._original_response = type('OriginalResponse', (), {'msg': msg})()
+
+    def _chunks(self, amt=None):
+        if self._iter is None:
+            self._iter = self._response.iter_bytes(amt)
+        return self._iter
+
+    def stream(self, amt=CHUNK_SIZE, decode_content=True):
+        if self._buffer:
+            data, self._buffer = self._buffer, b''
+            yield data
+        # yield from kullanılmaz: iter_content üreteci kapatılınca alttaki
+        # httpx akışı da kapanır, oysa urllib3'te okuma kaldığı yerden sürer
+        for chunk in self._chunks(amt):
+            yield chunk
+
+    def read(self, amt=None, decode_content=True, cache_content=False):
+        chunks = self._chunks()
+        while amt is None or len(self._buffer) < amt:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if amt is None:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def close(self):
+        self._response.close()
+
+    def release_conn(self):
+        self._response.close()
+
+
+class HTTPXAdapter(BaseAdapter):
+    """HTTP/2 destekli httpx istemcisini requests.Session'a bağlayan adaptör
+
+    Tek bir TCP bağlantısı üzerinden çoklu akış kullanıldığından parçalı
+    indirmelerde bağlantı sayısı azalır. Tekrar politikası create_retry()
+    ile aynı kuralları izler.
+    """
+
+    def __init__(self, stats, max_connections=DEFAULT_HOST_CONNECTIONS):
+        super().__init__()
+        self.stats = stats
+        self.httpx = httpx = optional_import('httpx')
+        limits = httpx.Limits(max_connections=max_connections,
+                              max_keepalive_connections=max_connections)
+        self.client = httpx.Client(http2=True, limits=limits, follow_redirects=False)
+
+    def _timeout(self, timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+        else:
+            connect = read = timeout
+        return self.httpx.Timeout(connect=connect, read=read, write=read, pool=None)
+
+    def _trace(self, event, info):
+        # httpcore olayları: yeni TCP bağlantısı açıldığında sayacı artır
+        if event == 'connection.connect_tcp.complete':
+            self.stats.connection_opened()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        retryable = request.method in RETRY_METHODS
+        attempt = 0
+        while True:
+            httpx_request = self.client.build_request(
+                request.method, request.url, headers=dict(request.headers),
+                content=request.body, timeout=self._timeout(timeout),
+                extensions={'trace': self._trace})
+            try:
+                response = self.client.send(httpx_request, stream=True)
+            except (self.httpx.ConnectError, self.httpx.ConnectTimeout) as e:
+                if not retryable or attempt >= RETRY_TOTAL:
+                    raise requests.exceptions.ConnectionError(e, request=request)
+                time.sleep(RETRY_BACKOFF * (2 ** attempt))
+                attempt += 1
+                continue
+            except self.httpx.TimeoutException as e:
+                raise requests.exceptions.Timeout(e, request=request)
+            except self.httpx.HTTPError as e:
+                raise requests.exceptions.ConnectionError(e, request=request)
+
+            if retryable and response.status_code in RETRY_STATUSES and attempt < RETRY_TOTAL:
+                wait = RETRY_BACKOFF * (2 ** attempt)
+                retry_after = response.headers.get('retry-after', '')
+                if retry_after.isdigit():
+                    wait = int(retry_after)
+                response.read()  # Gövdeyi tüket ki bağlantı havuza geri dönsün
+                response.close()
+                time.sleep(wait)
+                attempt += 1
+                continue
+            break
+
+        self.stats.request_done(attempt)
+        return self._build_response(request, response)
+
+    def _build_response(self, request, response):
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers)
+        result.encoding = get_encoding_from_headers(result.headers)
+        result.reason = response.reason_phrase
+        result.url = request.url
+        result.request = request
+        result.connection = self
+        result.raw = _HTTPXRaw(response)
+        extract_cookies_to_jar(result.cookies, request, result.raw)
+        return result
+
+    def close(self):
+        self.client.close()
+
+
+def create_session(base_url, max_connections=DEFAULT_HOST_CONNECTIONS, backend=None):
+    """Sunucu başına bağlantı sınırı olan paylaşılabilir bir oturum oluştur
+
+    pool_block=True sayesinde sınır dolduğunda yeni bağlantı açılmaz,
+    iş parçacıkları boşalan bağlantıyı bekler. Geçici hatalar
+    create_retry() politikasıyla tekrar denenir; istek ve bağlantı
+    sayıları session.transport_stats üzerinden okunabilir.
+    """
+    backend = backend or TRANSPORT_BACKEND
+    session = requests.Session()
+    stats = TransportStats()
+    if backend == 'httpx' and optional_import('httpx') is not None:
+        adapter = HTTPXAdapter(stats, max_connections)
+    else:
+        if backend == 'httpx':
+            print("⚠️  httpx kurulu değil, HTTP/1.1 (requests) kullanılıyor")
+        adapter = CountingHTTPAdapter(stats, pool_connections=4, pool_maxsize=max_connections,
+                                      pool_block=True, max_retries=create_retry())
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.transport_stats = stats
+
+    # User-Agent ve referer header'ları ekle
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': '*/*',
+        'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
+        'Referer': base_url.rstrip('/')
+    })
+    return session
+
+
+def session_pool_size(connections, transfers=DEFAULT_TRANSFERS):
+    """Yapılandırılmış eşzamanlılığa göre bağlantı havuzu boyutu
+
+    Aynı anda en fazla transfers × connections parça ya da PROBE_WORKERS
+    yoklama çalışır; havuz bunların büyüğü kadar olmalıdır ki iş
+    parçacıkları bağlantı beklemesin ve fazladan bağlantı açılmasın.
+    """
+    return max(PROBE_WORKERS, connections * transfers)
+
+
+def format_bytes(n):
+    """Byte sayısını okunabilir biçime çevir (ör. 12.3 MB)"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(n) < 1024 or unit == 'GB':
+            return f"{n:.1f} {unit}" if unit != 'B' else f"{int(n)} B"
+        n /= 1024
+
+
+def format_eta(seconds):
+    """Kalan süreyi s:dd:ss biçimine çevir"""
+    if seconds is None:
+        return '--:--'
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class ProgressTask:
+    """Tek bir aktarımın ilerlemesi; güncellemeler yalnızca sayaç artırır"""
+    
+    def __init__(self, reporter, task_id, label, url, total=0):
+        self.reporter = reporter
+        self.id = task_id
+        self.label = label
+        self.url = url
+        self.total = total
+        self.downloaded = 0
+        self.transferred = 0             # Bu çalıştırmada ağdan alınan byte
+        self.started = time.monotonic()
+        self.rate = 0.0
+        self._sample = (self.started, 0)
+        self._lock = threading.Lock()
+    
+    def reset(self, downloaded, total):
+        """Devam/yeniden başlama durumunda sayaçları ayarla"""
+        with self._lock:
+            self.downloaded = downloaded
+            self.total = total or 0
+            self._sample = (time.monotonic(), downloaded)
+    
+    def update(self, n):
+        with self._lock:
+            self.downloaded += n
+            self.transferred += n
+    
+    def finish(self, ok=True):
+        self.reporter._finish(self, ok)
+    
+    def _measure(self, now):
+        """Son ölçümden bu yana hızı güncelle (üstel ortalama)"""
+        with self._lock:
+            last_time, last_bytes = self._sample
+            elapsed = now - last_time
+            if elapsed > 0:
+                current = (self.downloaded - last_bytes) / elapsed
+                self.rate = current if not self.rate else 0.3 * current + 0.7 * self.rate
+                self._sample = (now, self.downloaded)
+            return self.downloaded, self.total, self.rate
+
+
+class ProgressReporter:
+    """Tüm aktarımların ilerlemesini sabit aralıkla gösteren ortak gösterge
+
+    İndirme döngüleri yalnızca sayaç artırır; ekrana yazma ayrı bir iş
+    parçacığında `interval` saniyede bir yapılır. Birden fazla aktarım
+    varsa tek satırda toplam gösterilir. Çıkış terminal değilse satır
+    yazma aralığı PROGRESS_LOG_INTERVAL'e çıkar. `json_fd` verilirse aynı
+    olaylar JSON satırları olarak bu dosya tanımlayıcısına da, terminal
+    aralığından bağımsız olarak `json_interval` saniyede bir yazılır.
+    """
+    
+    def __init__(self, interval=PROGRESS_INTERVAL, json_fd=None, stream=None,
+                 json_interval=PROGRESS_JSON_INTERVAL):
+        self.stream = stream or sys.stdout
+        self.interactive = hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self.interval = interval if self.interactive else max(interval, PROGRESS_LOG_INTERVAL)
+        self._json = os.fdopen(json_fd, 'w', buffering=1, closefd=False) if json_fd is not None else None
+        # Aktarım iş parçacıkları ve çizim iş parçacığı aynı akışa yazar; satırlar karışmasın
+        self._json_lock = threading.Lock()
+        # Çizim iş parçacığı iki aralıktan kısa olanıyla uyanır
+        self._tick = min(self.interval, json_interval) if self._json is not None else self.interval
+        self._written_at = time.monotonic()
+        self._tasks = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+    
+    def task(self, label, url=None, total=0):
+        """Yeni bir aktarım kaydet"""
+        with self._lock:
+            task = ProgressTask(self, self._next_id, label, url, total)
+            self._next_id += 1
+            self._tasks[task.id] = task
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='progress', daemon=True)
+                self._thread.start()
+        self._emit_json({'event': 'start', 'id': task.id, 'label': label, 'url': url})
+        return task
+    
+    def _finish(self, task, ok):
+        with self._lock:
+            self._tasks.pop(task.id, None)
+        downloaded, total, _ = task._measure(time.monotonic())
+        elapsed = time.monotonic() - task.started
+        self._emit_json({
+            'event': 'done', 'id': task.id, 'label': task.label, 'url': task.url, 'ok': ok,
+            'downloaded': downloaded, 'total': total, 'elapsed': round(elapsed, 3),
+            'avg_rate': round(downloaded / elapsed) if elapsed > 0 else None,
+        })
+    
+    def _emit_json(self, record):
+        if self._json is None:
+            return
+        record['ts'] = round(time.time(), 3)
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._json_lock:
+            try:
+                self._json.write(line)
+                self._json.flush()
+            except OSError:
+                pass
+    
+    def _run(self):
+        while True:
+            self._wake.wait(self._tick)
+            with self._lock:
+                tasks = list(self._tasks.values())
+                if not tasks:
+                    self._thread = None
+                    return
+            self._render(tasks)
+    
+    def _render(self, tasks):
+        now = time.monotonic()
+        downloaded = total = rate = 0
+        unknown_total = False
+        for task in tasks:
+            task_downloaded, task_total, task_rate = task._measure(now)
+            downloaded += task_downloaded
+            total += task_total
+            rate += task_rate
+            unknown_total = unknown_total or not task_total
+            self._emit_json({
+                'event': 'progress', 'id': task.id, 'label': task.label,
+                'downloaded': task_downloaded, 'total': task_total,
+                'rate': round(task_rate),
+                'eta': round((task_total - task_downloaded) / task_rate) if task_total and task_rate else None,
+            })
+        
+        if now - self._written_at < self.interval - 0.01:
+            return
+        self._written_at = now
+        
+        eta = (total - downloaded) / rate if total and rate and not unknown_total else None
+        if len(tasks) == 1:
+            prefix = f"  {tasks[0].label}:"
+        else:
+            prefix = f"  ⇣ {len(tasks)} aktarım:"
+        if total and not unknown_total:
+            line = (f"{prefix} {downloaded / total * 100:.1f}% ({format_bytes(downloaded)}/{format_bytes(total)}) "
+                    f"{format_bytes(rate)}/s ETA {format_eta(eta)}")
+        else:
+            line = f"{prefix} {format_bytes(downloaded)} {format_bytes(rate)}/s"
+        
+        if self.interactive:
+            self.stream.write(f"\r{line}\033[K")
+        else:
+            self.stream.write(line + '\n')
+        self.stream.flush()
+
+
+_progress_reporter = None
+_progress_reporter_lock = threading.Lock()
+
+
+def get_progress_reporter():
+    """Süreç genelinde paylaşılan varsayılan ilerleme göstergesi"""
+    global _progress_reporter
+    with _progress_reporter_lock:
+        if _progress_reporter is None:
+            _progress_reporter = ProgressReporter()
+        return _progress_reporter
+
+
+def configure_progress(interval=PROGRESS_INTERVAL, json_fd=None, json_interval=PROGRESS_JSON_INTERVAL):
+    """Varsayılan ilerleme göstergesini yeniden yapılandır"""
+    global _progress_reporter
+    with _progress_reporter_lock:
+        _progress_reporter = ProgressReporter(interval=interval, json_fd=json_fd, json_interval=json_interval)
+        return _progress_reporter
+
+
+class Metrics:
+    """Çalıştırma boyunca aşama süreleri, sayaçlar ve aktarım hızları
+
+    `phase(ad)` bağlamı süreyi ölçüp aynı addaki önceki ölçümlere ekler
+    (sayı, toplam, en uzun). İş parçacıkları arasında paylaşılır. Rapor
+    JSON olarak ya da node exporter'ın okuyacağı Prometheus textfile
+    biçiminde yazılabilir.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self._started_monotonic = time.monotonic()
+        self.phases = {}
+        self.counters = {}
+        self.transfers = []
+        self._transports = {}
+    
+    @contextmanager
+    def phase(self, name):
+        """Bloğun süresini `name` aşamasına ekle (hata olsa da)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+    
+    def add_time(self, name, seconds):
+        with self._lock:
+            phase = self.phases.setdefault(name, {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            phase['count'] += 1
+            phase['seconds'] += seconds
+            phase['max_seconds'] = max(phase['max_seconds'], seconds)
+    
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+    
+    def transfer(self, url, path, nbytes, seconds, ok=True):
+        """Tek aktarımın bu çalıştırmada indirilen byte'larını ve hızını kaydet"""
+        with self._lock:
+            self.transfers.append({
+                'url': url,
+                'path': path,
+                'bytes': nbytes,
+                'seconds': round(seconds, 3),
+                'bytes_per_second': round(nbytes / seconds) if seconds > 0 else None,
+                'ok': ok,
+            })
+    
+    def track_transport(self, host, stats):
+        """Oturumun bağlantı/tekrar sayaçlarını rapora dahil et"""
+        if stats is not None:
+            with self._lock:
+                self._transports[host] = stats
+    
+    def report(self):
+        with self._lock:
+            phases = {name: dict(p, seconds=round(p['seconds'], 4), max_seconds=round(p['max_seconds'], 4))
+                      for name, p in sorted(self.phases.items())}
+            counters = dict(sorted(self.counters.items()))
+            transfers = list(self.transfers)
+            transports = dict(self._transports)
+        total_bytes = sum(t['bytes'] for t in transfers)
+        transfer_seconds = sum(t['seconds'] for t in transfers)
+        return {
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'elapsed': round(time.monotonic() - self._started_monotonic, 3),
+            'phases': phases,
+            'counters': counters,
+            'transfers': transfers,
+            'transfer_totals': {
+                'count': len(transfers),
+                'bytes': total_bytes,
+                'seconds': round(transfer_seconds, 3),
+                'bytes_per_second': round(total_bytes / transfer_seconds) if transfer_seconds > 0 else None,
+            },
+            'transport': {host: stats.snapshot() for host, stats in transports.items()},
+        }
+    
+    def summary(self, limit=6):
+        """En uzun süren aşamalar (terminal için tek satır)"""
+        with self._lock:
+            top = sorted(self.phases.items(), key=lambda item: item[1]['seconds'], reverse=True)[:limit]
+        return ', '.join(f"{name} {p['seconds']:.2f}s" + (f" ×{p['count']}" if p['count'] > 1 else '')
+                         for name, p in top)
+    
+    def write_json(self, path):
+        _atomic_write_text(path, json.dumps(self.report(), ensure_ascii=False, indent=2))
+    
+    def write_prometheus(self, path, prefix=METRICS_PREFIX):
+        """Prometheus textfile biçiminde yaz (node exporter textfile collector)"""
+        report = self.report()
+        lines = []
+        
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_prometheus_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}" if label_text
+                             else f"{prefix}_{name} {value}")
+        
+        phases = report['phases'].items()
+        metric('run_timestamp_seconds', 'Son çalıştırmanın başlangıç zamanı', [({}, round(self.started, 3))])
+        metric('run_duration_seconds', 'Son çalıştırmanın süresi', [({}, report['elapsed'])])
+        metric('phase_seconds', 'Aşama başına toplam süre', [({'phase': n}, p['seconds']) for n, p in phases])
+        metric('phase_max_seconds', 'Aşamanın en uzun tek süresi', [({'phase': n}, p['max_seconds']) for n, p in phases])
+        metric('phase_count', 'Aşamanın çalışma sayısı', [({'phase': n}, p['count']) for n, p in phases])
+        metric('events', 'Olay sayaçları', [({'name': n}, v) for n, v in report['counters'].items()])
+        totals = report['transfer_totals']
+        metric('transfer_files', 'Aktarılan dosya sayısı', [({}, totals['count'])])
+        metric('transfer_bytes', 'Bu çalıştırmada indirilen byte', [({}, totals['bytes'])])
+        metric('transfer_bytes_per_second', 'Ortalama aktarım hızı', [({}, totals['bytes_per_second'] or 0)])
+        transport = report['transport'].items()
+        metric('http_requests', 'HTTP istek sayısı', [({'host': h}, t['requests']) for h, t in transport])
+        metric('http_connections_opened', 'Açılan yeni bağlantı sayısı',
+               [({'host': h}, t['connections_opened']) for h, t in transport])
+        metric('http_retries', 'Tekrar denenen istek sayısı', [({'host': h}, t['retries']) for h, t in transport])
+        _atomic_write_text(path, '\n'.join(lines) + '\n')
+
+
+def _prometheus_escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _atomic_write_text(path, text):
+    """Okuyucular (ör. node exporter) yarım dosya görmesin diye atomik yaz"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+_metrics = Metrics()
+
+
+def get_metrics():
+    """Süreç genelinde paylaşılan ölçüm kaydı"""
+    return _metrics
+
+
+def timed(phase):
+    """Metodun süresini nesnenin `metrics` kaydında `phase` aşamasına ekle"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.phase(phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class Profiler:
+    """cProfile'ı ana iş parçacığında ve sonradan başlayan tüm iş parçacıklarında çalıştır
+
+    İndirme işinin çoğu iş parçacığı havuzlarında yapıldığından yalnızca
+    ana iş parçacığını ölçmek yanıltıcı olur. Python 3.12 ve sonrasında
+    cProfile sys.monitoring ile tüm süreci tek profilde izler (ikinci bir
+    profil açılamaz); önceki sürümlerde her yeni iş parçacığı kendi
+    profilini başlatır ve sonunda hepsi birleştirilir.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles = []
+    
+    def _new_profile(self):
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        profile.enable()
+    
+    def _thread_hook(self, *args):
+        # threading.setprofile kancası iş parçacığının ilk olayında bir kez çalışır
+        sys.setprofile(None)
+        self._new_profile()
+    
+    def start(self):
+        if sys.version_info < (3, 12):
+            threading.setprofile(self._thread_hook)
+        self._new_profile()
+    
+    def stop(self, path, top=PROFILE_TOP):
+        """Profilleri birleştirip `path` dosyasına yaz ve özeti döndür"""
+        if sys.version_info < (3, 12):
+            threading.setprofile(None)
+        with self._lock:
+            profiles = list(self._profiles)
+        for profile in profiles:
+            profile.disable()
+        stats = pstats.Stats(*profiles)
+        stats.dump_stats(path)
+        output = io.StringIO()
+        stats.stream = output
+        stats.sort_stats('cumulative').print_stats(top)
+        return output.getvalue()
+
+
+def file_hash(path, algorithm=HASH_ALGORITHM):
+    """Dosyanın özetini hesapla (doğrulama komutu için)"""
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StreamHasher:
+    """İndirilen veriyi yazılırken özetleyen hesaplayıcı
+
+    Dosya başından itibaren sırayla gelen veri doğrudan özetlenir. Parçalı
+    indirmede özet sınırının ilerisine yazılan parçalar, sınır oraya
+    ulaştığında dosyadan (henüz sayfa önbelleğindeyken) en fazla
+    HASH_CATCHUP_STEP'lik bloklarla okunur; ayrı bir tam okuma geçişi yapılmaz.
+    """
+    
+    def __init__(self, path, algorithm=HASH_ALGORITHM):
+        self.path = path
+        self.algorithm = algorithm
+        self.position = 0
+        self._digest = hashlib.new(algorithm)
+        self._lock = threading.Lock()
+    
+    def update_at(self, offset, data):
+        """`offset` konumuna yazılan veriyi, özet sınırındaysa özetle"""
+        with self._lock:
+            if offset == self.position:
+                self._digest.update(data)
+                self.position += len(data)
+    
+    def catch_up(self, available, limit=HASH_CATCHUP_STEP):
+        """Diske yazılmış ama henüz özetlenmemiş veriyi `available` konumuna kadar oku"""
+        with self._lock:
+            if available <= self.position:
+                return
+            end = available if limit is None else min(available, self.position + limit)
+            with open(self.path, 'rb') as f:
+                f.seek(self.position)
+                while self.position < end:
+                    block = f.read(min(1024 * 1024, end - self.position))
+                    if not block:
+                        break
+                    self._digest.update(block)
+                    self.position += len(block)
+    
+    def hexdigest(self, size):
+        """Dosyanın tamamı özetlendikten sonra sonucu döndür"""
+        self.catch_up(size, limit=None)
+        if self.position != size:
+            raise IOError(f"Özet eksik: {self.position}/{size} bytes")
+        return self._digest.hexdigest()
+
+
+def _read_vint(f):
+    """EBML değişken uzunluklu tamsayı oku: (değer, bilinmeyen_boyut)"""
+    first = f.read(1)
+    if not first:
+        raise ValueError('beklenmeyen dosya sonu')
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first[0] & mask:
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ValueError('geçersiz EBML vint')
+    rest = f.read(length - 1)
+    if len(rest) != length - 1:
+        raise ValueError('beklenmeyen dosya sonu')
+    value = first[0] & (mask - 1)
+    for byte in rest:
+        value = (value << 8) | byte
+    return value, value == (1 << (7 * length)) - 1
+
+
+def _check_matroska(f, size):
+    """WebM/Matroska: EBML başlığı + Segment boyutu dosya boyutuyla uyumlu mu?"""
+    f.seek(4)
+    header_size, _ = _read_vint(f)
+    f.seek(f.tell() + header_size)
+    segment_id = f.read(4)
+    if segment_id != b'\x18\x53\x80\x67':
+        return False, 'Segment öğesi bulunamadı'
+    segment_size, unknown = _read_vint(f)
+    if unknown:
+        return True, 'webm (segment boyutu bilinmiyor)'
+    expected = f.tell() + segment_size
+    if expected > size:
+        return False, f'webm kesik: {size}/{expected} bytes'
+    return True, 'webm'
+
+
+def _check_isobmff(f, size):
+    """MP4: üst seviye kutuların boyutları dosyayı tam olarak kaplıyor mu?"""
+    position = 0
+    boxes = []
+    while position < size:
+        f.seek(position)
+        header = f.read(8)
+        if len(header) < 8:
+            return False, f'mp4 kesik kutu başlığı ({position})'
+        box_size = int.from_bytes(header[:4], 'big')
+        box_type = header[4:8].decode('latin-1')
+        if box_size == 1:
+            large = f.read(8)
+            if len(large) < 8:
+                return False, 'mp4 kesik kutu başlığı'
+            box_size = int.from_bytes(large, 'big')
+        elif box_size == 0:
+            box_size = size - position
+        if box_size < 8:
+            return False, f'mp4 geçersiz kutu boyutu ({box_type})'
+        boxes.append(box_type)
+        position += box_size
+    if position != size:
+        return False, f'mp4 kesik: {size}/{position} bytes'
+    if 'moov' not in boxes:
+        return False, 'mp4 moov kutusu yok'
+    return True, 'mp4'
+
+
+def check_container(path):
+    """Medya dosyasının başlığını ve (mümkünse) kesik olup olmadığını kontrol et
+
+    Dönüş: (geçerli_mi, açıklama)
+    """
+    size = os.path.getsize(path)
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(12)
+            if head.startswith(b'\x1a\x45\xdf\xa3'):
+                return _check_matroska(f, size)
+            if head[4:8] in (b'ftyp', b'moov', b'free', b'mdat', b'wide', b'skip'):
+                return _check_isobmff(f, size)
+            if head.startswith(b'OggS'):
+                return True, 'ogg'
+            if head.startswith(b'ID3') or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+                return True, 'mp3'
+            if head.lstrip().startswith(b'<'):
+                return False, 'XML/HTML yanıtı (medya değil)'
+            return False, 'bilinmeyen biçim'
+    except (OSError, ValueError) as e:
+        return False, f'okunamadı: {e}'
+
+
+def write_integrity_sidecar(path, record):
+    """Doğrulama sonucunu `<dosya>.integrity.json` yan dosyasına yaz"""
+    tmp_path = path + INTEGRITY_SUFFIX + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(record, checked_at=time.strftime('%Y-%m-%dT%H:%M:%S')), f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path + INTEGRITY_SUFFIX)
+
+
+def verify_file(path):
+    """Arşivdeki dosyayı yan dosyasındaki kayda göre yeniden doğrula"""
+    try:
+        with open(path + INTEGRITY_SUFFIX, 'r', encoding='utf-8') as f:
+            expected = json.load(f)
+    except (OSError, ValueError) as e:
+        return {'path': path, 'ok': False, 'error': f'yan dosya okunamadı: {e}'}
+    if not os.path.exists(path):
+        return {'path': path, 'ok': False, 'error': 'dosya yok'}
+    
+    size = os.path.getsize(path)
+    digest = file_hash(path, expected.get('algorithm', HASH_ALGORITHM))
+    container_ok, container = check_container(path)
+    errors = []
+    if size != expected.get('size'):
+        errors.append(f"boyut {size} != {expected.get('size')}")
+    if digest != expected.get('hash'):
+        errors.append('özet uyuşmuyor')
+    if not container_ok:
+        errors.append(f'kapsayıcı: {container}')
+    return {'path': path, 'ok': not errors, 'error': ', '.join(errors) or None}
+
+
+def verify_archive(directory, workers=None):
+    """Arşivdeki tüm dosyaları çekirdekler arasında paralel doğrula"""
+    paths = sorted(
+        str(sidecar)[:-len(INTEGRITY_SUFFIX)]
+        for sidecar in Path(directory).rglob('*' + INTEGRITY_SUFFIX)
+    )
+    if not paths:
+        print(f"⚠ Doğrulanacak dosya bulunamadı: {directory}")
+        return []
+    
+    print(f"🔎 {len(paths)} dosya doğrulanıyor...")
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        results = list(pool.map(verify_file, paths))
+    
+    for r in results:
+        if r['ok']:
+            print(f"✓ {r['path']}")
+        else:
+            print(f"❌ {r['path']}: {r['error']}")
+    failed = sum(1 for r in results if not r['ok'])
+    print(f"\n{'✅' if not failed else '⚠'} {len(results) - failed}/{len(results)} dosya sağlam")
+    return results
+
+
+class BlobStore:
+    """İçerik özetiyle adreslenen dosya deposu
+
+    İndirilen her dosya `<kök>/<algoritma>/<ilk iki karakter>/<özet>` altına
+    sabit bağlantı (hardlink) ile eklenir. Aynı içerik başka bir kayıtta
+    tekrar indirilirse yeni kopya silinip depodaki dosyaya bağlanır; böylece
+    kayıt dizinleri ayrı kalırken disk alanı bir kez kullanılır. Dosya sistemi
+    sabit bağlantıyı desteklemiyorsa dosyalar olduğu gibi bırakılır.
+    """
+    
+    def __init__(self, root):
+        self.root = root
+        self.supported = True
+    
+    def blob_path(self, algorithm, digest):
+        return os.path.join(self.root, algorithm, digest[:2], digest)
+    
+    def adopt(self, path, algorithm, digest):
+        """Dosyayı depoya ekle ya da depodaki aynı içerikle değiştir
+
+        Dönüş: içerik depoda zaten varsa True (tekrar kaldırıldı)
+        """
+        if not self.supported:
+            return False
+        blob = self.blob_path(algorithm, digest)
+        try:
+            Path(blob).parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(path, blob)
+                return False
+            except FileExistsError:
+                pass
+            if os.path.samefile(path, blob):
+                return False
+            if os.path.getsize(blob) != os.path.getsize(path):
+                return False
+            # Aynı içerik zaten var: dosyayı depodakine bağla
+            tmp_path = path + '.dedup'
+            os.link(blob, tmp_path)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            print(f"\n⚠ Sabit bağlantı desteklenmiyor, tekrar kaldırma kapatıldı: {e}")
+            self.supported = False
+            return False
+
+
+MUX_CONTAINERS = {'mkv': 'matroska', 'mp4': 'mp4'}
+_mux_slots = threading.BoundedSemaphore(MUX_PROCESSES)
+
+
+def ffmpeg_available():
+    """ffmpeg çalıştırılabilir dosyası PATH'te mi?"""
+    return shutil.which(FFMPEG_BINARY) is not None
+
+
+def is_streamable(url):
+    """Kapsayıcı boru (pipe) üzerinden baştan sona okunabilir mi?"""
+    return os.path.splitext(urlparse(url).path)[1].lower() in STREAMABLE_EXTENSIONS
+
+
+def build_mux_command(inputs, output_path, mux_format=MUX_FORMAT):
+    """Girdileri yeniden kodlamadan tek kapsayıcıda birleştiren ffmpeg komutu
+
+    `inputs`: (tür, kaynak) listesi; kaynak dosya yolu ya da `pipe:N`.
+    Video girdilerinin görüntü akışları, ses girdilerinin ses akışları
+    alınır; ayrı ses dosyası yoksa ilk videonun sesi kullanılır.
+    """
+    command = [FFMPEG_BINARY, '-hide_banner', '-nostdin', '-loglevel', 'error', '-y']
+    for _, source in inputs:
+        command += ['-i', source]
+    has_audio = any(kind == 'audio' for kind, _ in inputs)
+    for i, (kind, _) in enumerate(inputs):
+        command += ['-map', f'{i}:v?' if kind == 'video' else f'{i}:a?']
+    if not has_audio:
+        command += ['-map', '0:a?']
+    command += ['-c', 'copy', '-f', MUX_CONTAINERS[mux_format]]
+    if mux_format == 'mp4':
+        command += ['-movflags', '+faststart']
+    command.append(output_path)
+    return command
+
+
+class SyncManifest:
+    """Çıktı dizinindeki dosyaların kaydı (`manifest.json`)
+
+    Her dosya için URL, boyut, ETag, Last-Modified ve içerik özeti tutulur;
+    eşitleme modunda değişmemiş dosyaları atlamak için kullanılır.
+    """
+    
+    FILENAME = 'manifest.json'
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, self.FILENAME)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('files', {})
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    def _key(self, path):
+        return os.path.relpath(path, self.directory).replace(os.sep, '/')
+    
+    def get(self, path):
+        with self._lock:
+            return self.entries.get(self._key(path))
+    
+    def record(self, path, entry):
+        """Dosya kaydını ekle/güncelle ve manifest'i atomik olarak yaz"""
+        with self._lock:
+            self.entries[self._key(path)] = dict(entry, recorded_at=time.strftime('%Y-%m-%dT%H:%M:%S'))
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'files': self.entries}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+class TokenBucket:
+    """Tüm bağlantıların paylaştığı jeton kovası hız sınırlayıcısı
+
+    Her okunan parça kadar jeton harcanır; jeton kalmadıysa çağıran iş
+    parçacığı gereken süre kadar bekler (soket okuması da böylece yavaşlar).
+    Sınır `set_rate` ile çalışma sırasında değiştirilebilir.
+    """
+    
+    def __init__(self, rate=None, burst=None):
+        self._lock = threading.Lock()
+        self._tokens = 0.0
+        self._last = time.monotonic()
+        self.set_rate(rate, burst)
+    
+    def set_rate(self, rate, burst=None):
+        """Sınırı değiştir (byte/s); None veya 0 sınırsız demektir"""
+        with self._lock:
+            self.rate = rate or None
+            self.burst = burst or (max(CHUNK_SIZE, rate) if rate else 0)
+            self._tokens = min(self._tokens, self.burst)
+            self._last = time.monotonic()
+    
+    def consume(self, n):
+        with self._lock:
+            if not self.rate:
+                return
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= n
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+_bandwidth_limiter = TokenBucket(BANDWIDTH_LIMIT)
+
+
+def get_bandwidth_limiter():
+    """Süreç genelinde paylaşılan bant genişliği sınırlayıcısı"""
+    return _bandwidth_limiter
+
+
+def set_bandwidth_limit(rate):
+    """Toplam bant genişliği sınırını çalışma sırasında değiştir (byte/s)"""
+    _bandwidth_limiter.set_rate(rate)
+
+
+class BandwidthLimitWatcher:
+    """Bant genişliği sınırını bir dosyadan izleyip çalışan aktarımlara uygula
+
+    Dosyada '20M', '512K' gibi bir değer bulunur; boş, '0' veya 'none'
+    sınırı kaldırır. Dosya her BANDWIDTH_FILE_POLL saniyede bir (değişiklik
+    zamanına bakılarak) kontrol edilir; POSIX'te SIGHUP hemen yeniden
+    okutur. `path` None ise hiçbir şey yapmaz. Bağlam yöneticisi olarak
+    kullanılır: `with BandwidthLimitWatcher(path): ...`
+    """
+    
+    def __init__(self, path, limiter=None, interval=BANDWIDTH_FILE_POLL):
+        self.path = path
+        self.limiter = limiter or get_bandwidth_limiter()
+        self.interval = interval
+        self._stamp = None
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._previous_handler = None
+    
+    def reload(self, force=False):
+        """Dosya değiştiyse (ya da force ise) sınırı yeniden oku ve uygula"""
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if stamp == self._stamp and not force:
+                return
+            with open(self.path, 'r', encoding='utf-8') as f:
+                text = f.read().strip()
+        except OSError:
+            return
+        self._stamp = stamp
+        try:
+            rate = None if text.lower() in ('', '0', 'none', 'off') else parse_rate(text)
+        except argparse.ArgumentTypeError as e:
+            print(f"\n⚠ Bant genişliği dosyası okunamadı ({self.path}): {e}")
+            return
+        if rate != self.limiter.rate:
+            self.limiter.set_rate(rate)
+            print(f"\n🚦 Bant genişliği sınırı: {format_bytes(rate) + '/s' if rate else 'sınırsız'}")
+    
+    def _run(self):
+        while not self._stopped.is_set():
+            force = self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self._stopped.is_set():
+                self.reload(force=force)
+    
+    def _on_sighup(self, signum, frame):
+        self._wake.set()
+    
+    def __enter__(self):
+        if self.path is None:
+            return self
+        self.reload()
+        self._thread = threading.Thread(target=self._run, name='bw-limit-file', daemon=True)
+        self._thread.start()
+        # Sinyal işleyicisi yalnızca ana iş parçacığından kurulabilir
+        if hasattr(signal, 'SIGHUP') and threading.current_thread() is threading.main_thread():
+            self._previous_handler = signal.signal(signal.SIGHUP, self._on_sighup)
+        return self
+    
+    def __exit__(self, *exc):
+        if self._thread is None:
+            return
+        if self._previous_handler is not None:
+            signal.signal(signal.SIGHUP, self._previous_handler)
+            self._previous_handler = None
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+
+
+class TransferScheduler:
+    """Dosya aktarımlarını öncelik sırasına göre çalıştıran zamanlayıcı
+
+    İşler (öncelik, boyut) anahtarıyla bir öncelik kuyruğunda bekler; varsayılan
+    olarak ses dosyaları videolardan, küçük dosyalar büyüklerden önce alınır.
+    Toplu modda tüm kayıtlar aynı zamanlayıcıyı paylaşır.
+    """
+    
+    def __init__(self, max_transfers=DEFAULT_TRANSFERS):
+        self.max_transfers = max(1, max_transfers)
+        self._queue = queue.PriorityQueue()
+        self._counter = 0
+        self._lock = threading.Lock()
+        self._threads = []
+    
+    def submit_many(self, jobs):
+        """(tür, boyut, fonksiyon, args, kwargs) işlerini birlikte kuyruğa ekle
+
+        Tüm işler iş parçacıkları başlamadan kuyruğa girer, böylece ilk
+        alınan iş de öncelik sırasına uyar. Dönüş: Future listesi
+        """
+        futures = []
+        with self._lock:
+            for kind, size, fn, args, kwargs in jobs:
+                future = Future()
+                self._counter += 1
+                key = (KIND_PRIORITY.get(kind, len(KIND_PRIORITY)),
+                       size if size is not None else float('inf'), self._counter)
+                self._queue.put((key, future, fn, args, kwargs))
+                futures.append(future)
+            while len(self._threads) < self.max_transfers:
+                thread = threading.Thread(target=self._worker, name='transfer', daemon=True)
+                self._threads.append(thread)
+                thread.start()
+        return futures
+    
+    def submit(self, kind, size, fn, *args, **kwargs):
+        """Aktarımı kuyruğa ekle; sonucu için Future döner"""
+        return self.submit_many([(kind, size, fn, args, kwargs)])[0]
+    
+    def _worker(self):
+        while True:
+            _, future, fn, args, kwargs = self._queue.get()
+            if fn is None:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+    
+    def close(self):
+        """Kuyruk boşaldığında iş parçacıklarını durdur"""
+        with self._lock:
+            for _ in self._threads:
+                self._counter += 1
+                self._queue.put(((float('inf'), float('inf'), self._counter), None, None, None, None))
+            self._threads = []
+
+
+class DiscoveryCache:
+    """Kayıt kimliğine göre keşif sonuçlarını saklayan kalıcı (SQLite) önbellek
+
+    Her kayıt için bulunan video/ses URL'leri, boyutları ve ETag /
+    Last-Modified değerleri tutulur. TTL'i dolan kayıtlar okunmaz; kayıt
+    sayısı sınırı aşılınca en uzun süredir kullanılmayanlar silinir.
+    """
+    
+    def __init__(self, path=None, ttl=DISCOVERY_CACHE_TTL, max_entries=DISCOVERY_CACHE_MAX_ENTRIES):
+        self.path = path or os.path.join(CACHE_DIR, 'discovery.sqlite')
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS recordings ('
+                ' recording_id TEXT PRIMARY KEY,'
+                ' data TEXT NOT NULL,'
+                ' created REAL NOT NULL,'
+                ' last_used REAL NOT NULL)'
+            )
+    
+    def get(self, recording_id):
+        """Geçerli önbellek kaydını döndür (yoksa veya süresi dolduysa None)"""
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute(
+                'SELECT data, created FROM recordings WHERE recording_id = ?', (recording_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self._db.execute('DELETE FROM recordings WHERE recording_id = ?', (recording_id,))
+                return None
+            self._db.execute('UPDATE recordings SET last_used = ? WHERE recording_id = ?', (now, recording_id))
+        return json.loads(row[0])
+    
+    def put(self, recording_id, data):
+        """Kaydı yaz ve gerekiyorsa en az kullanılanları sil"""
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO recordings (recording_id, data, created, last_used) VALUES (?, ?, ?, ?)',
+                (recording_id, json.dumps(data), now, now)
+            )
+            self._db.execute(
+                'DELETE FROM recordings WHERE recording_id NOT IN '
+                '(SELECT recording_id FROM recordings ORDER BY last_used DESC LIMIT ?)',
+                (self.max_entries,)
+            )
+    
+    def delete(self, recording_id):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM recordings WHERE recording_id = ?', (recording_id,))
+
+
+_discovery_cache = None
+_discovery_cache_lock = threading.Lock()
+
+
+def get_discovery_cache():
+    """Süreç genelinde paylaşılan varsayılan keşif önbelleği"""
+    global _discovery_cache
+    with _discovery_cache_lock:
+        if _discovery_cache is None:
+            _discovery_cache = DiscoveryCache()
+        return _discovery_cache
+
+
+class SessionStore:
+    """Sunucu ve kullanıcı başına oturum çerezlerini saklayan kalıcı depo
+
+    Her kayıt için çerezler ve başarılı olan giriş adresi tutulur; parola
+    saklanmaz. Dosya 0600 izniyle atomik olarak yazılır, böylece aynı anda
+    çalışan süreçler yarım dosya okumaz.
+    """
+    
+    def __init__(self, path=None, max_age=SESSION_CACHE_MAX_AGE):
+        self.path = path or SESSION_CACHE_FILE
+        self.max_age = max_age
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _key(host, username):
+        return f"{username or ''}@{host}"
+    
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get('sessions', {}) if data.get('version') == 1 else {}
+    
+    def _write(self, sessions):
+        directory = Path(self.path).parent
+        directory.mkdir(parents=True, exist_ok=True, mode=0o700)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'sessions': sessions}, f, indent=2)
+        os.replace(tmp_path, self.path)
+    
+    def get(self, host, username):
+        """Kayıtlı oturumu döndür (yoksa veya çok eskiyse None)"""
+        with self._lock:
+            entry = self._read().get(self._key(host, username))
+        if not entry or time.time() - entry.get('saved_at', 0) > self.max_age:
+            return None
+        return entry
+    
+    def put(self, host, username, login_url, cookies):
+        """Oturum çerezlerini ve çalışan giriş adresini kaydet"""
+        entry = {
+            'login_url': login_url,
+            'saved_at': time.time(),
+            'cookies': [
+                {
+                    'name': c.name,
+                    'value': c.value,
+                    'domain': c.domain,
+                    'path': c.path,
+                    'secure': bool(c.secure),
+                    'expires': c.expires,
+                    'rest': {'HttpOnly': None} if c.has_nonstandard_attr('HttpOnly') else {},
+                }
+                for c in cookies
+            ],
+        }
+        with self._lock:
+            # Diğer süreçlerin yazdıklarını kaybetmemek için dosyayı yeniden oku
+            sessions = self._read()
+            sessions[self._key(host, username)] = entry
+            self._write(sessions)
+    
+    def delete(self, host, username):
+        with self._lock:
+            sessions = self._read()
+            if sessions.pop(self._key(host, username), None) is not None:
+                self._write(sessions)
+
+
+_session_store = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Süreç genelinde paylaşılan varsayılan oturum deposu"""
+    global _session_store
+    with _session_store_lock:
+        if _session_store is None:
+            _session_store = SessionStore()
+        return _session_store
+
+
+class BrowserUnavailableError(RuntimeError):
+    """Chrome / ChromeDriver başlatılamadı"""
+
+
+def create_chrome_driver():
+    """Ağ yakalama için yapılandırılmış headless Chrome oluştur"""
+    webdriver = optional_import('selenium.webdriver')
+    if webdriver is None:
+        raise BrowserUnavailableError("Selenium bulunamadı. 'pip install selenium' ile yükleyin.")
+    chrome_options = webdriver.ChromeOptions()
+    chrome_options.add_argument('--headless')  # Arka planda çalış
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    chrome_options.add_argument('--autoplay-policy=no-user-gesture-required')
+    
+    # Yalnızca Network domain'inin CDP olaylarını performance log'a yönlendir
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'INFO'})
+    chrome_options.add_experimental_option('perfLoggingPrefs', {
+        'enableNetwork': True,
+        'enablePage': False,
+    })
+    
+    try:
+        return webdriver.Chrome(options=chrome_options)
+    except Exception as e:
+        raise BrowserUnavailableError(str(e)) from e
+
+
+class BrowserPool:
+    """Birden fazla kayıt için sıcak tutulan headless Chrome havuzu
+
+    Tarayıcılar ilk ihtiyaçta başlatılır ve `size` adede kadar açık tutulur.
+    Her kiralama için ayrı sekme açılır; tarayıcı `max_uses` kullanımdan
+    sonra ya da kullanım sırasında hata oluşursa kapatılıp yenisiyle değiştirilir.
+    """
+    
+    def __init__(self, size=1, max_uses=BROWSER_MAX_USES):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self._idle = []
+        self._uses = {}
+        self._created = 0
+        # Boşta tarayıcı ya da yeni tarayıcı için yer açılınca bekleyenler uyandırılır
+        self._cond = threading.Condition()
+        self._closed = False
+    
+    def _acquire(self):
+        with self._cond:
+            while not self._idle and self._created >= self.size:
+                self._cond.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+        try:
+            driver = create_chrome_driver()
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._uses[driver] = 0
+        return driver
+    
+    def _discard(self, driver):
+        with self._cond:
+            self._created -= 1
+            self._uses.pop(driver, None)
+            self._cond.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    @contextmanager
+    def lease(self):
+        """Havuzdan bir tarayıcı kirala; blok bitince havuza geri döner"""
+        driver = self._acquire()
+        healthy = False
+        try:
+            yield driver
+            healthy = True
+        finally:
+            with self._cond:
+                self._uses[driver] = self._uses.get(driver, 0) + 1
+                reuse = healthy and not self._closed and self._uses[driver] < self.max_uses
+                if reuse:
+                    self._idle.append(driver)
+                    self._cond.notify()
+            if not reuse:
+                self._discard(driver)
+    
+    def close(self):
+        """Havuzdaki tüm tarayıcıları kapat"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for driver in idle:
+            self._discard(driver)
 
-# Selenium için opsiyonel import
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.chrome.service import Service
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
 
 class VideoDownloader:
-    def __init__(self, base_url, username=None, password=None):
+    def __init__(self, base_url, username=None, password=None, connections=DEFAULT_CONNECTIONS, session=None,
+                 use_cache=True, discovery_cache=None, capture_deadline=SELENIUM_CAPTURE_DEADLINE,
+                 browser_pool=None, progress=None, rate_limiter=None, scheduler=None,
+                 use_session_cache=True, session_store=None, discovery=None, use_browser=True,
+                 metrics=None, debug_dir=None):
         self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
         self.username = username
         self.password = password
+        self.connections = max(1, int(connections))
+        self.recording_assets = {}
+        self.use_cache = use_cache
+        self._discovery_cache = discovery_cache
+        self.capture_deadline = capture_deadline
+        self.browser_pool = browser_pool
+        self._progress = progress
+        self.rate_limiter = rate_limiter or get_bandwidth_limiter()
+        self.scheduler = scheduler
+        self.use_session_cache = use_session_cache
+        self._session_store = session_store
+        self.discovery = discovery
+        self.use_browser = use_browser
+        self.metrics = metrics or get_metrics()
+        # Verilirse HTML taramasında oynatıcı sayfası bu dizine kaydedilir (hata ayıklama için)
+        self.debug_dir = debug_dir
         
-        # User-Agent ve referer header'ları ekle
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': '*/*',
-            'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Referer': self.base_url
-        })
+        # Toplu modda oturum açılmış ortak oturum paylaşılır
+        if session is not None:
+            self.session = session
+            self.metrics.track_transport(urlparse(self.base_url).netloc, getattr(session, 'transport_stats', None))
+            return
+        
+        # Havuz, verilen zamanlayıcının aynı anda çalıştırdığı aktarım sayısına göre boyutlanır
+        transfers = self.scheduler.max_transfers if self.scheduler is not None else DEFAULT_TRANSFERS
+        self.session = create_session(self.base_url, session_pool_size(self.connections, transfers))
+        self.metrics.track_transport(urlparse(self.base_url).netloc, self.session.transport_stats)
         
         # Eğer kullanıcı adı ve şifre varsa, oturum aç
         if username and password:
             self.login()
     
-    def login(self):
-        """Oturum açma işlemi"""
+    @property
+    def session_store(self):
+        if self._session_store is None and self.use_session_cache:
+            self._session_store = get_session_store()
+        return self._session_store
+    
+    def _looks_logged_in(self, response):
+        """Yanıt oturumun açık olduğunu gösteriyor mu?
+
+        Giriş sayfası hâlâ parola alanı içeriyorsa ya da tekrar giriş
+        sayfasına yönlendiriliyorsa oturum açık değildir.
+        """
+        if response.status_code >= 400:
+            return False
+        if response.is_redirect:
+            return 'login' not in response.headers.get('location', '').lower()
+        return not PASSWORD_FIELD_RE.search(response.text)
+    
+    def session_is_valid(self, login_url):
+        """Mevcut çerezlerle oturumun hâlâ açık olduğunu tek istekle kontrol et"""
+        self.session.cookies.clear_expired_cookies()
+        if not len(self.session.cookies):
+            return False
+        try:
+            response = self.session.get(login_url, allow_redirects=False, timeout=TIMEOUTS['login'])
+            return self._looks_logged_in(response)
+        except requests.RequestException:
+            return False
+    
+    @timed('login.restore')
+    def restore_session(self):
+        """Kayıtlı oturumu yükle; geçerliyse giriş adresini döndür"""
+        store = self.session_store
+        if store is None:
+            return None
+        host = urlparse(self.base_url).netloc
+        entry = store.get(host, self.username)
+        if entry is None:
+            return None
+        for c in entry['cookies']:
+            self.session.cookies.set_cookie(create_cookie(**c))
+        if self.session_is_valid(entry['login_url']):
+            return entry['login_url']
+        # Oturum süresi dolmuş: eski çerezleri at, giriş adresini hatırla
+        self.session.cookies.clear()
+        return None
+    
+    @timed('login')
+    def login(self, force=False):
+        """Oturum açma işlemi
+
+        Önce kayıtlı oturum denenir; geçersizse giriş adresleri (önceden
+        çalışan adres başta olmak üzere) sırayla denenir ve başarılı oturum
+        kaydedilir.
+        """
         base_domain = self.base_url.split('/playback')[0]
-        login_urls = [
-            f"{base_domain}/login",
-            f"{base_domain}/login.php",
-            f"{base_domain}/index.php/login",
-        ]
+        host = urlparse(self.base_url).netloc
+        store = self.session_store
+        
+        if not force and self.restore_session():
+            print("✓ Kayıtlı oturum kullanılıyor")
+            self.metrics.count('login.session_reused')
+            return True
+        
+        login_urls = [f"{base_domain}{path}" for path in LOGIN_PATHS]
+        entry = store.get(host, self.username) if store is not None else None
+        if entry and entry['login_url'] in login_urls:
+            login_urls.remove(entry['login_url'])
+            login_urls.insert(0, entry['login_url'])
         
         for login_url in login_urls:
             try:
                 # Önce login sayfasını al (CSRF token için)
-                self.session.get(login_url, timeout=10)
+                page = self.session.get(login_url, timeout=TIMEOUTS['login'])
+                if page.status_code == 404:
+                    continue
                 
                 # Login POST isteği
                 response = self.session.post(login_url, data={
@@ -64,58 +1859,146 @@ class VideoDownloader:
                     'password': self.password,
                     'login': 'Login',
                     'submit': 'Login'
-                }, allow_redirects=True, timeout=10)
+                }, allow_redirects=True, timeout=TIMEOUTS['login'])
                 
-                if response.status_code == 200 or response.status_code == 302:
-                    print(f"✓ Oturum açma denemesi başarılı: {response.status_code}")
+                self.metrics.count('login.attempts')
+                if self._looks_logged_in(response):
+                    print(f"✓ Oturum açıldı: {login_url}")
+                    if store is not None:
+                        store.put(host, self.username, login_url, self.session.cookies)
                     return True
-            except Exception as e:
+            except requests.RequestException:
                 continue
         
-        print(f"⚠ Oturum açma denemeleri başarısız (devam ediliyor)")
-        return False
+        print(f"⚠ Oturum açma denemeleri başarısız (devam ediliyor)")
+        return False
+    
+    def _prepare_tab(self, driver):
+        """Sekmeyi hazırla: gereksiz dosyaları engelle, oturum çerezlerini aktar"""
+        driver.execute_cdp_cmd('Network.enable', {})
+        # Görsel, font ve slayt dosyalarının yüklenmesini engelle
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': SELENIUM_BLOCKED_URLS})
+        
+        # Önceki kayıtların çerezlerini temizle, requests oturumunun çerezlerini ekle
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        for cookie in list(self.session.cookies):
+            params = {
+                'name': cookie.name,
+                'value': cookie.value or '',
+                'path': cookie.path or '/',
+                'secure': bool(cookie.secure),
+            }
+            if cookie.domain:
+                params['domain'] = cookie.domain
+            else:
+                params['url'] = self.base_url
+            driver.execute_cdp_cmd('Network.setCookie', params)
+        
+        # Önceki kullanımlardan kalan ağ olaylarını at
+        driver.get_log('performance')
+    
+    @contextmanager
+    def _browser_tab(self):
+        """Kullanıma hazır bir tarayıcı sekmesi ver
+
+        Havuz varsa havuzdaki tarayıcıda yeni sekme açılır ve sonra kapatılır,
+        yoksa tek kullanımlık bir tarayıcı başlatılır.
+        """
+        started = time.perf_counter()
+        if self.browser_pool is None:
+            driver = create_chrome_driver()
+            try:
+                self._prepare_tab(driver)
+                self.metrics.add_time('selenium.startup', time.perf_counter() - started)
+                yield driver
+            finally:
+                driver.quit()
+            return
+        
+        with self.browser_pool.lease() as driver:
+            base_handle = driver.current_window_handle
+            driver.switch_to.new_window('tab')
+            try:
+                self._prepare_tab(driver)
+                self.metrics.add_time('selenium.startup', time.perf_counter() - started)
+                yield driver
+            finally:
+                driver.close()
+                driver.switch_to.window(base_handle)
+    
+    @staticmethod
+    def _media_kind(url, mime_type):
+        """Ağ yanıtını 'video', 'audio' veya None olarak sınıflandır"""
+        lower_url = url.lower().split('?')[0]
+        mime_type = (mime_type or '').lower()
+        if mime_type.startswith('video/') or lower_url.endswith(('.webm', '.mp4')):
+            if 'audio' in lower_url and not mime_type.startswith('video/'):
+                return 'audio'
+            return 'video'
+        if mime_type.startswith('audio/') or lower_url.endswith(('.ogg', '.mp3')):
+            return 'audio'
+        return None
+    
+    @timed('selenium.capture')
+    def _capture_media_responses(self, driver, video_urls, audio_urls, deadline):
+        """CDP Network.responseReceived olaylarından medya akışlarını yakala
+
+        Performance log her okumada boşaltılır ve yalnızca responseReceived
+        olayları JSON olarak çözülür. Medya bulunduktan sonra SELENIUM_SETTLE_TIME
+        boyunca yeni akış gelmezse ya da süre dolarsa döner.
+        """
+        end_time = time.monotonic() + deadline
+        last_found = None
+        while time.monotonic() < end_time:
+            entries = driver.get_log('performance')
+            parse_started = time.perf_counter()
+            for entry in entries:
+                raw = entry.get('message', '')
+                if '"Network.responseReceived"' not in raw:
+                    continue
+                try:
+                    response = json.loads(raw)['message']['params']['response']
+                except (ValueError, KeyError, TypeError):
+                    continue
+                url = response.get('url', '')
+                kind = self._media_kind(url, response.get('mimeType'))
+                target = video_urls if kind == 'video' else audio_urls if kind == 'audio' else None
+                if target is not None and url not in target:
+                    target.append(url)
+                    last_found = time.monotonic()
+            self.metrics.add_time('selenium.log_parse', time.perf_counter() - parse_started)
+            self.metrics.count('selenium.log_entries', len(entries))
+            
+            if last_found is not None and time.monotonic() - last_found >= SELENIUM_SETTLE_TIME:
+                break
+            time.sleep(SELENIUM_POLL_INTERVAL)
     
-    def get_presentation_data_with_selenium(self):
+    def get_presentation_data_with_selenium(self, deadline=None):
         """Selenium ile tarayıcıyı kullanarak video URL'lerini bul"""
-        if not SELENIUM_AVAILABLE:
+        by = optional_import('selenium.webdriver.common.by')
+        if by is None:
             print("❌ Selenium bulunamadı. 'pip install selenium' ile yükleyin.")
             return [], []
         
         print("🌐 Selenium ile tarayıcı açılıyor...")
         video_urls = []
         audio_urls = []
+        deadline = deadline if deadline is not None else self.capture_deadline
         
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')  # Arka planda çalış
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            
-            # Network loglarını almak için performance log'ları etkinleştir
-            chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
-            
-            # Chrome WebDriver'ı dene
-            try:
-                driver = webdriver.Chrome(options=chrome_options)
-            except Exception as e:
-                # ChromeDriver bulunamazsa, alternatif yöntemler dene
-                print(f"⚠ ChromeDriver bulunamadı: {e}")
-                print("💡 ChromeDriver'ı yüklemek için: brew install chromedriver (macOS) veya https://chromedriver.chromium.org/")
-                return [], []
-            
-            try:
+            with self._browser_tab() as driver:
                 print("📡 Sayfa yükleniyor...")
-                driver.get(self.base_url)
+                with self.metrics.phase('selenium.page_load'):
+                    driver.get(self.base_url)
                 
-                # Sayfanın yüklenmesini bekle
-                time.sleep(5)
+                # Medya akışları görünene kadar (veya süre dolana kadar) ağ olaylarını izle
+                print("📊 Network trafiği izleniyor...")
+                self._capture_media_responses(driver, video_urls, audio_urls, deadline)
                 
                 # Video elementlerini bul
                 print("🔍 Video elementleri aranıyor...")
-                video_elements = driver.find_elements(By.TAG_NAME, 'video')
-                source_elements = driver.find_elements(By.TAG_NAME, 'source')
+                video_elements = driver.find_elements(by.By.TAG_NAME, 'video')
+                source_elements = driver.find_elements(by.By.TAG_NAME, 'source')
                 
                 # Video elementlerinden src'leri al
                 for video in video_elements:
@@ -141,27 +2024,6 @@ class VideoDownloader:
                         elif 'audio' in full_url.lower() and full_url not in audio_urls:
                             audio_urls.append(full_url)
                 
-                # Network loglarından video URL'lerini bul
-                print("📊 Network trafiği analiz ediliyor...")
-                logs = driver.get_log('performance')
-                for log in logs:
-                    try:
-                        message = json.loads(log['message'])['message']
-                        if message['method'] == 'Network.responseReceived':
-                            url = message['params']['response']['url']
-                            content_type = message['params']['response'].get('headers', {}).get('content-type', '')
-                            
-                            # Video veya ses dosyalarını bul
-                            if any(ext in url.lower() for ext in ['.webm', '.mp4', '.ogg', '.mp3']):
-                                if 'video' in content_type.lower() or 'video' in url.lower():
-                                    if url not in video_urls:
-                                        video_urls.append(url)
-                                elif 'audio' in content_type.lower() or 'audio' in url.lower():
-                                    if url not in audio_urls:
-                                        audio_urls.append(url)
-                    except:
-                        pass
-                
                 # JavaScript execution ile video URL'lerini bul
                 try:
                     js_video_urls = driver.execute_script("""
@@ -183,202 +2045,264 @@ class VideoDownloader:
                             video_urls.append(full_url)
                 except:
                     pass
-                
-            finally:
-                driver.quit()
             
             return video_urls, audio_urls
             
+        except BrowserUnavailableError as e:
+            # ChromeDriver bulunamazsa, alternatif yöntemler dene
+            print(f"⚠ ChromeDriver bulunamadı: {e}")
+            print("💡 ChromeDriver'ı yüklemek için: brew install chromedriver (macOS) veya https://chromedriver.chromium.org/")
+            return [], []
         except Exception as e:
             print(f"❌ Selenium hatası: {e}")
             import traceback
             traceback.print_exc()
             return [], []
     
+    def resolve_recording(self):
+        """Tarayıcı açmadan, kayıt kimliğinden standart BBB dosya URL'lerini çöz
+
+        Playback URL'indeki kayıt kimliğiyle `/presentation/<id>/...` altındaki
+        bilinen dosyalar oluşturulur ve hafif yoklamalarla doğrulanır.
+        Bulunan metadata.xml / shapes.svg adresleri `self.recording_assets`
+        içinde saklanır.
+        """
+        self.recording_assets = {}
+        if not parse_recording_id(self.base_url):
+            return [], []
+        
+        profile = self.get_server_profile()
+        candidate_videos = self._candidate_urls(profile.get('recording_video_paths', []))
+        candidate_audios = self._candidate_urls(profile.get('recording_audio_paths', []))
+        candidate_meta = self._candidate_urls(profile.get('recording_meta_paths', []))
+        found = self.probe_candidates(candidate_videos + candidate_audios + candidate_meta)
+        
+        video_urls = [url for url in candidate_videos if found[url]]
+        audio_urls = [url for url in candidate_audios if found[url]]
+        for url in candidate_meta:
+            if found[url]:
+                self.recording_assets[url.rsplit('/', 1)[-1]] = url
+        
+        if video_urls or audio_urls:
+            print("\n📹 Çözümlenen video URL'leri:")
+            for url in video_urls:
+                print(f"   - {url}")
+            if audio_urls:
+                print("\n🎵 Çözümlenen ses URL'leri:")
+                for url in audio_urls:
+                    print(f"   - {url}")
+        return video_urls, audio_urls
+    
+    @property
+    def progress(self):
+        if self._progress is None:
+            self._progress = get_progress_reporter()
+        return self._progress
+    
+    @property
+    def discovery_cache(self):
+        if self._discovery_cache is None and self.use_cache:
+            self._discovery_cache = get_discovery_cache()
+        return self._discovery_cache
+    
+    @timed('revalidate')
+    def revalidate_url(self, url, info):
+        """Önbellekteki dosyayı koşullu istekle doğrula
+
+        Dönüş: güncel dosya bilgisi (değişmediyse aynısı) veya dosya artık
+        yoksa None
+        """
+        headers = {}
+        if info.get('etag'):
+            headers['If-None-Match'] = info['etag']
+        if info.get('last_modified'):
+            headers['If-Modified-Since'] = info['last_modified']
+        if not headers:
+            return self.probe_url(url)
+        
+        try:
+            if urlparse(url).netloc in _no_head_hosts:
+                response = self.session.get(url, stream=True, timeout=TIMEOUTS['probe'],
+                                            headers=dict(headers, Range='bytes=0-0'))
+            else:
+                response = self.session.head(url, timeout=TIMEOUTS['probe'], headers=headers, allow_redirects=True)
+            with response:
+                if response.status_code == 304:
+                    return info
+        except Exception:
+            return None
+        # Dosya değişmiş ya da sunucu koşullu isteği desteklemiyor: yeniden yokla
+        return self.probe_url(url)
+    
+    @timed('discovery.cache')
+    def _load_cached_discovery(self):
+        """Önbellekte bu kayıt varsa yeniden doğrulayıp URL'leri döndür"""
+        cache = self.discovery_cache
+        if cache is None:
+            return None
+        recording_id = recording_id_from_url(self.base_url)
+        data = cache.get(recording_id)
+        if not data or data.get('base_url') != self.base_url:
+            return None
+        
+        files = data['videos'] + data['audios']
+        with ThreadPoolExecutor(max_workers=max(1, min(PROBE_WORKERS, len(files)))) as pool:
+            infos = list(pool.map(lambda f: self.revalidate_url(f['url'], f), files))
+        if not all(infos):
+            print("↺ Önbellekteki dosyalar artık geçerli değil, yeniden keşfediliyor")
+            cache.delete(recording_id)
+            return None
+        
+        # Doğrulanan kaydı güncel bilgilerle yeniden yaz (TTL yeniden başlar)
+        for f, info in zip(files, infos):
+            f.update(info)
+        cache.put(recording_id, data)
+        self.recording_assets = data.get('assets', {})
+        print(f"⚡ Önbellekten alındı: {recording_id} ({len(data['videos'])} video, {len(data['audios'])} ses)")
+        return [f['url'] for f in data['videos']], [f['url'] for f in data['audios']]
+    
+    def _store_discovery(self, video_urls, audio_urls):
+        """Keşif sonucunu boyut ve doğrulayıcılarıyla önbelleğe yaz"""
+        cache = self.discovery_cache
+        if cache is None or not (video_urls or audio_urls):
+            return
+        infos = self.probe_candidates(video_urls + audio_urls)
+        
+        def entry(url):
+            return dict(infos.get(url) or {}, url=url)
+        
+        cache.put(recording_id_from_url(self.base_url), {
+            'base_url': self.base_url,
+            'videos': [entry(url) for url in video_urls],
+            'audios': [entry(url) for url in audio_urls],
+            'assets': self.recording_assets,
+        })
+    
+    @timed('discovery')
     def get_presentation_data(self):
-        """Sunum verilerini ve video URL'lerini al"""
-        # Önce Selenium ile deneyelim
-        if SELENIUM_AVAILABLE:
-            print("🔍 Selenium ile video URL'leri aranıyor...")
-            video_urls, audio_urls = self.get_presentation_data_with_selenium()
+        """Sunum verilerini ve video URL'lerini al
+
+        Önce kalıcı önbelleğe bakılır; belirli bir keşif stratejisi
+        (`discovery`) istendiyse önbellek okunmaz, strateji her zaman çalışır.
+        """
+        cached = None
+        try:
+            if not self.discovery:
+                cached = self._load_cached_discovery()
+        except Exception as e:
+            print(f"⚠ Keşif önbelleği okunamadı: {e}")
+        if cached:
+            self.metrics.count('discovery.cache_hit')
+            return cached
+        self.metrics.count('discovery.cache_miss')
+        
+        video_urls, audio_urls = self.discover_presentation_data()
+        try:
+            self._store_discovery(video_urls, audio_urls)
+        except Exception as e:
+            print(f"⚠ Keşif önbelleği yazılamadı: {e}")
+        return video_urls, audio_urls
+    
+    def discover_presentation_data(self):
+        """Sunum verilerini ve video URL'lerini keşfet
+
+        Stratejiler DISCOVERY_STRATEGIES sırasıyla denenir; `discovery`
+        verilmişse yalnızca o strateji çalışır, `use_browser=False` ise
+        Selenium atlanır.
+        """
+        strategies = [self.discovery] if self.discovery else DISCOVERY_STRATEGIES
+        strategies = [s for s in strategies if s != 'selenium' or self.use_browser]
+        for strategy in strategies:
+            video_urls, audio_urls = getattr(self, f'_discover_{strategy}')()
             if video_urls or audio_urls:
                 return video_urls, audio_urls
-            print("⚠ Selenium ile video bulunamadı, manuel yöntem deneniyor...")
-        
+        return [], []
+    
+    @timed('discovery.resolver')
+    def _discover_resolver(self):
+        """Tarayıcısız çözümleyici: kayıt kimliğinden standart yolları yokla"""
+        print("🔍 Kayıt kimliğinden dosyalar çözümleniyor...")
+        return self.resolve_recording()
+    
+    @timed('discovery.selenium')
+    def _discover_selenium(self):
+        """Tarayıcıda oynatıcıyı açıp ağ trafiğinden medya URL'lerini yakala"""
+        if not selenium_available():
+            return [], []
+        print("🔍 Selenium ile video URL'leri aranıyor...")
+        video_urls, audio_urls = self.get_presentation_data_with_selenium()
+        if not (video_urls or audio_urls):
+            print("⚠ Selenium ile video bulunamadı")
+        return video_urls, audio_urls
+    
+    @timed('discovery.html')
+    def _discover_html(self):
+        """Oynatıcı HTML'ini ve kayıt dosyalarını tara, bilinen yolları yokla"""
         try:
-            # Sunum HTML sayfasını al
-            response = self.session.get(self.base_url)
-            response.raise_for_status()
-            
-            html_content = response.text
-            
-            # HTML içeriğini kaydet (debug için)
-            debug_html_path = 'downloads/page_source.html'
-            Path(debug_html_path).parent.mkdir(exist_ok=True)
-            with open(debug_html_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            print(f"💾 HTML kaynağı kaydedildi: {debug_html_path}")
-            
-            # Video ve ses dosyalarını bul
-            video_urls = []
+            # Sunum HTML sayfasını akış halinde al ve tek geçişte tara
+            extractor = MediaURLExtractor(self.base_url)
+            regex_seconds = 0.0
             
-            # video.webm veya video.mp4 araması
-            video_patterns = [
-                r'"(/presentation/[^"]+video\.webm)"',
-                r'"(/presentation/[^"]+video\.mp4)"',
-                r'"(/presentation/[^"]+deskshare\.webm)"',
-                r'"(/presentation/[^"]+deskshare\.mp4)"',
-                r'"video":"([^"]+video[^"]+)"',
-                r'"deskshare":"([^"]+deskshare[^"]+)"',
-            ]
+            def feed(chunk):
+                nonlocal regex_seconds
+                started = time.perf_counter()
+                extractor.feed(chunk)
+                regex_seconds += time.perf_counter() - started
             
-            # Ses dosyaları
-            audio_patterns = [
-                r'"(/presentation/[^"]+audio\.ogg)"',
-                r'"(/presentation/[^"]+audio\.mp3)"',
-                r'"audio":"([^"]+audio[^"]+)"',
-            ]
+            debug_html_path = None
+            if self.debug_dir:
+                Path(self.debug_dir).mkdir(parents=True, exist_ok=True)
+                debug_html_path = os.path.join(self.debug_dir, DEBUG_HTML_FILENAME)
             
-            # JavaScript içindeki video URL'lerini bul
-            js_patterns = [
-                r'["\']([^"\']*presentation[^"\']*video[^"\']*\.(webm|mp4))["\']',
-                r'["\']([^"\']*presentation[^"\']*deskshare[^"\']*\.(webm|mp4))["\']',
-                r'["\']([^"\']*presentation[^"\']*camera[^"\']*\.(webm|mp4))["\']',
-                r'src:\s*["\']([^"\']*video[^"\']*)["\']',
-                r'url:\s*["\']([^"\']*video[^"\']*)["\']',
-            ]
-            
-            for pattern in js_patterns:
-                matches = re.findall(pattern, html_content, re.IGNORECASE)
-                for match in matches:
-                    url = match[0] if isinstance(match, tuple) else match
-                    if url.startswith('/'):
-                        full_url = urljoin(self.base_url, url)
-                    elif url.startswith('http'):
-                        full_url = url
-                    else:
-                        full_url = urljoin(self.base_url, '/' + url.lstrip('/'))
-                    if full_url not in video_urls and 'video' in full_url.lower():
-                        video_urls.append(full_url)
-            
-            # Video URL'lerini bul
-            for pattern in video_patterns:
-                matches = re.findall(pattern, html_content)
-                for match in matches:
-                    if match.startswith('/'):
-                        full_url = urljoin(self.base_url, match)
-                    else:
-                        full_url = match
-                    if full_url not in video_urls:
-                        video_urls.append(full_url)
-            
-            # Ses URL'lerini bul
-            audio_urls = []
-            js_audio_patterns = [
-                r'["\']([^"\']*presentation[^"\']*audio[^"\']*\.(ogg|mp3|webm))["\']',
-                r'src:\s*["\']([^"\']*audio[^"\']*)["\']',
-                r'url:\s*["\']([^"\']*audio[^"\']*)["\']',
-            ]
-            
-            for pattern in js_audio_patterns:
-                matches = re.findall(pattern, html_content, re.IGNORECASE)
-                for match in matches:
-                    url = match[0] if isinstance(match, tuple) else match
-                    if url.startswith('/'):
-                        full_url = urljoin(self.base_url, url)
-                    elif url.startswith('http'):
-                        full_url = url
-                    else:
-                        full_url = urljoin(self.base_url, '/' + url.lstrip('/'))
-                    if full_url not in audio_urls and 'audio' in full_url.lower():
-                        audio_urls.append(full_url)
-            
-            for pattern in audio_patterns:
-                matches = re.findall(pattern, html_content)
-                for match in matches:
-                    if match.startswith('/'):
-                        full_url = urljoin(self.base_url, match)
-                    else:
-                        full_url = match
-                    if full_url not in audio_urls:
-                        audio_urls.append(full_url)
-            
-            # metadata.xml'den bilgi al
-            metadata_url = urljoin(self.base_url, '/presentation/metadata.xml')
-            try:
-                metadata_response = self.session.get(metadata_url)
-                if metadata_response.status_code == 200:
-                    metadata_content = metadata_response.text
-                    # metadata'dan video URL'leri çıkar
-                    video_matches = re.findall(r'<video src="([^"]+)"', metadata_content)
-                    for match in video_matches:
-                        full_url = urljoin(self.base_url, match)
-                        if full_url not in video_urls:
-                            video_urls.append(full_url)
-            except:
-                pass
-            
-            # shapes.svg'den bilgi al
-            shapes_url = urljoin(self.base_url, '/presentation/shapes.svg')
-            try:
-                shapes_response = self.session.get(shapes_url)
-                if shapes_response.status_code == 200:
-                    shapes_content = shapes_response.text
-                    video_matches = re.findall(r'href="([^"]+video[^"]+)"', shapes_content)
-                    for match in video_matches:
-                        full_url = urljoin(self.base_url, match)
-                        if full_url not in video_urls:
-                            video_urls.append(full_url)
-            except:
-                pass
-            
-            # Bilinen video dosya yollarını doğrudan kontrol et
-            common_video_paths = [
-                '/presentation/video.webm',
-                '/presentation/video.mp4',
-                '/presentation/deskshare.webm',
-                '/presentation/deskshare.mp4',
-                '/presentation/camera.webm',
-                '/presentation/camera.mp4',
-            ]
-            
-            common_audio_paths = [
-                '/presentation/audio.ogg',
-                '/presentation/audio.mp3',
-                '/presentation/audio.webm',
-            ]
-            
-            # Video dosyalarını kontrol et (HEAD yerine GET ile küçük bir chunk al)
-            for path in common_video_paths:
-                test_url = urljoin(self.base_url, path)
+            with self.session.get(self.base_url, stream=True, timeout=TIMEOUTS['discovery']) as response:
+                response.raise_for_status()
+                # HTML içeriğini parça parça tara (istenirse debug için kaydet)
+                debug_file = open(debug_html_path, 'wb') if debug_html_path else None
                 try:
-                    # HEAD request yerine GET ile ilk byte'ı kontrol et
-                    test_response = self.session.get(test_url, stream=True, timeout=10, headers={'Range': 'bytes=0-1023'})
-                    if test_response.status_code in [200, 206]:  # 206 = Partial Content
-                        content_type = test_response.headers.get('content-type', '')
-                        # XML hatası değilse, gerçek video dosyası
-                        if 'xml' not in content_type.lower():
-                            if test_url not in video_urls:
-                                video_urls.append(test_url)
-                except Exception as e:
-                    pass
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        if debug_file is not None:
+                            debug_file.write(chunk)
+                        feed(chunk)
+                finally:
+                    if debug_file is not None:
+                        debug_file.close()
+            extractor.close()
+            if debug_html_path:
+                print(f"💾 HTML kaynağı kaydedildi: {debug_html_path}")
             
-            # Ses dosyalarını kontrol et
-            for path in common_audio_paths:
-                test_url = urljoin(self.base_url, path)
+            # metadata.xml ve shapes.svg'den bilgi al (aynı çıkarıcıyla)
+            assets = self.recording_assets
+            for asset_url in (
+                assets.get('metadata.xml', urljoin(self.base_url, '/presentation/metadata.xml')),
+                assets.get('shapes.svg', urljoin(self.base_url, '/presentation/shapes.svg')),
+            ):
                 try:
-                    test_response = self.session.get(test_url, stream=True, timeout=10, headers={'Range': 'bytes=0-1023'})
-                    if test_response.status_code in [200, 206]:
-                        content_type = test_response.headers.get('content-type', '')
-                        if 'xml' not in content_type.lower():
-                            if test_url not in audio_urls:
-                                audio_urls.append(test_url)
-                except Exception as e:
+                    with self.session.get(asset_url, stream=True, timeout=TIMEOUTS['discovery']) as asset_response:
+                        if asset_response.status_code == 200:
+                            for chunk in asset_response.iter_content(chunk_size=CHUNK_SIZE):
+                                feed(chunk)
+                    extractor.close()
+                except:
                     pass
             
-            # Tüm URL'leri temizle ve tekrarları kaldır
-            video_urls = list(set(video_urls))
-            audio_urls = list(set(audio_urls))
+            self.metrics.add_time('extract.regex', regex_seconds)
+            
+            # Masaüstü paylaşımı da video olarak indirilir
+            video_urls = extractor.urls('video') + extractor.urls('deskshare')
+            audio_urls = extractor.urls('audio')
+            
+            # Bilinen video ve ses dosya yollarını doğrudan (paralel) kontrol et
+            profile = self.get_server_profile()
+            candidate_videos = self._candidate_urls(profile['video_paths'])
+            candidate_audios = self._candidate_urls(profile['audio_paths'])
+            found = self.probe_candidates(candidate_videos + candidate_audios)
+            
+            for test_url in candidate_videos:
+                if found[test_url] and test_url not in video_urls:
+                    video_urls.append(test_url)
+            for test_url in candidate_audios:
+                if found[test_url] and test_url not in audio_urls:
+                    audio_urls.append(test_url)
             
             # Bulunan URL'leri yazdır
             if video_urls:
@@ -398,60 +2322,738 @@ class VideoDownloader:
             traceback.print_exc()
             return [], []
     
-    def download_file(self, url, output_path):
-        """Dosyayı indir"""
+    def get_server_profile(self):
+        """Bu sunucu için aday yol profilini döndür"""
+        host = urlparse(self.base_url).netloc
+        return SERVER_PROFILES.get(host, SERVER_PROFILES['default'])
+    
+    def _candidate_urls(self, paths):
+        """Profil yollarını bu kayıt için tam URL'lere çevir"""
+        recording_id = recording_id_from_url(self.base_url)
+        return [urljoin(self.base_url, path.format(recording_id=recording_id)) for path in paths]
+    
+    @staticmethod
+    def _file_info(response):
+        """Yanıt başlıklarından dosya boyutu ve doğrulayıcıları çıkar"""
+        size = response.headers.get('content-length')
+        match = re.search(r'/(\d+)$', response.headers.get('content-range', ''))
+        if match:
+            size = match.group(1)
+        return {
+            'size': int(size) if size else None,
+            'etag': response.headers.get('etag'),
+            'last_modified': response.headers.get('last-modified'),
+        }
+    
+    @timed('probe')
+    def probe_url(self, url):
+        """Aday URL'de gerçek bir medya dosyası var mı?
+
+        Önce HEAD denenir; sunucu HEAD desteklemiyorsa küçük bir Range GET
+        yapılır. Yanıt gövdesi okunmaz ve bağlantı her durumda havuza döner.
+
+        Dönüş: dosya varsa {'size', 'etag', 'last_modified'}, yoksa None
+        """
+        host = urlparse(url).netloc
+        # metadata.xml / shapes.svg dışında XML yanıtı sunucu hatasıdır
+        expects_markup = urlparse(url).path.lower().endswith(('.xml', '.svg'))
         try:
-            print(f"📥 İndiriliyor: {url}")
+            if host not in _no_head_hosts:
+                self.metrics.count('probe.head')
+                with self.session.head(url, timeout=TIMEOUTS['probe'], allow_redirects=True) as response:
+                    if response.status_code not in (405, 501):
+                        content_type = response.headers.get('content-type', '')
+                        # XML hatası değilse, gerçek medya dosyası
+                        if response.status_code == 200 and (expects_markup or 'xml' not in content_type.lower()):
+                            return self._file_info(response)
+                        return None
+                _no_head_hosts.add(host)
             
-            # Referer header'ı ekle
-            headers = {'Referer': self.base_url}
-            response = self.session.get(url, stream=True, headers=headers, timeout=30)
+            self.metrics.count('probe.range_get')
+            with self.session.get(url, stream=True, timeout=TIMEOUTS['probe'],
+                                  headers={'Range': 'bytes=0-1023'}) as response:
+                if response.status_code in [200, 206]:  # 206 = Partial Content
+                    content_type = response.headers.get('content-type', '')
+                    if expects_markup or 'xml' not in content_type.lower():
+                        return self._file_info(response)
+                return None
+        except Exception:
+            self.metrics.count('probe.error')
+            return None
+    
+    @timed('probe.batch')
+    def probe_candidates(self, urls):
+        """Aday URL'leri aynı anda yokla; sonuçlar kayıt kimliğine göre önbelleğe alınır
+
+        Dönüş: {url: dosya bilgisi veya None}
+        """
+        recording_id = recording_id_from_url(self.base_url)
+        results = {}
+        pending = []
+        with _probe_cache_lock:
+            for url in urls:
+                if (recording_id, url) in _probe_cache:
+                    results[url] = _probe_cache[(recording_id, url)]
+                elif url not in pending:
+                    pending.append(url)
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(pending))) as pool:
+                for url, info in zip(pending, pool.map(self.probe_url, pending)):
+                    results[url] = info
+            with _probe_cache_lock:
+                for url in pending:
+                    _probe_cache[(recording_id, url)] = results[url]
+        return results
+    
+    @timed('transfer.range_probe')
+    def probe_ranges(self, url):
+        """Sunucunun Range desteğini, dosya boyutunu ve doğrulayıcılarını yokla
+
+        Dönüş: {'total_size', 'accepts_ranges', 'etag', 'last_modified'}
+        veya desteklenmeyen URL için None
+        """
+        headers = {'Referer': self.base_url, 'Range': 'bytes=0-1023'}
+        with self.session.get(url, stream=True, headers=headers, timeout=TIMEOUTS['transfer']) as response:
             response.raise_for_status()
-            
+            first_chunk = response.raw.read(1024, decode_content=True)
+            first_chunk_str = first_chunk.decode('utf-8', errors='ignore')
+            if 'unsupportedRequest' in first_chunk_str or 'FAILED' in first_chunk_str:
+                return None
+
+            info = {
+                'total_size': int(response.headers.get('content-length', 0)),
+                'accepts_ranges': False,
+                'etag': response.headers.get('etag'),
+                'last_modified': response.headers.get('last-modified'),
+            }
+
+            # 206 + Content-Range: sunucu Range isteğini gerçekten uyguluyor
+            if response.status_code == 206:
+                content_range = response.headers.get('content-range', '')
+                match = re.match(r'bytes\s+\d+-\d+/(\d+)', content_range)
+                if match:
+                    info['total_size'] = int(match.group(1))
+                    info['accepts_ranges'] = True
+            return info
+
+    @staticmethod
+    def _load_part_state(state_path, url):
+        """Yarım kalan indirmenin yan dosyasını oku (aynı URL değilse yok say)"""
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('url') != url:
+            return None
+        return state
+
+    @staticmethod
+    def _save_part_state(state_path, state):
+        """Yan dosyayı atomik olarak yaz (önce geçici dosya, sonra rename)"""
+        tmp_path = state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, state_path)
+
+    @staticmethod
+    def _validators_match(state, etag, last_modified):
+        """Kaydedilen ETag/Last-Modified ile sunucudakiler aynı mı?"""
+        if state.get('etag') or etag:
+            return state.get('etag') == etag
+        if state.get('last_modified') or last_modified:
+            return state.get('last_modified') == last_modified
+        # Doğrulayıcı yoksa yalnızca boyuta güvenebiliriz
+        return True
+
+    @staticmethod
+    def _contiguous_bytes(state):
+        """Dosyanın başından itibaren kesintisiz yazılmış byte sayısı"""
+        if 'segments' not in state:
+            return state.get('downloaded', 0)
+        contiguous = 0
+        for segment in sorted(state['segments'], key=lambda s: s['start']):
+            if segment['start'] != contiguous:
+                break
+            contiguous += segment['done']
+            if segment['start'] + segment['done'] <= segment['end']:
+                break
+        return contiguous
+
+    def _split_ranges(self, start, total_size):
+        """Dosyayı bağlantı sayısına göre byte aralıklarına böl"""
+        segment_size = max(MIN_SEGMENT_SIZE, -(-(total_size - start) // self.connections))
+        ranges = []
+        while start < total_size:
+            end = min(start + segment_size, total_size) - 1
+            ranges.append({'start': start, 'end': end, 'done': 0})
+            start = end + 1
+        return ranges
+
+    def _download_segment(self, url, part_path, segment, validator, progress):
+        """Tek bir byte aralığını indirip dosyadaki yerine yaz (kaldığı yerden devam eder)"""
+        last_error = None
+        for attempt in range(1, SEGMENT_RETRIES + 1):
+            position = segment['start'] + segment['done']
+            end = segment['end']
+            if position > end:
+                return
+            headers = {'Referer': self.base_url, 'Range': f'bytes={position}-{end}'}
+            if validator:
+                headers['If-Range'] = validator
+            try:
+                with self.session.get(url, stream=True, headers=headers, timeout=TIMEOUTS['transfer']) as response:
+                    response.raise_for_status()
+                    content_range = response.headers.get('content-range', '')
+                    if response.status_code != 206 or not content_range.startswith(f'bytes {position}-'):
+                        raise IOError(f"Sunucu aralığı uygulamadı ({response.status_code}, {content_range!r})")
+
+                    # Tamponsuz yazım: yan dosyaya kaydedilen her byte diskte olmalı
+                    with open(part_path, 'r+b', buffering=0) as f:
+                        f.seek(position)
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            if not chunk:
+                                continue
+                            self.rate_limiter.consume(len(chunk))
+                            chunk = chunk[:end + 1 - position]
+                            f.write(chunk)
+                            progress(segment, position, chunk)
+                            position += len(chunk)
+                            if position > end:
+                                break
+
+                if position <= end:
+                    raise IOError(f"Eksik parça: {position - segment['start']}/{end - segment['start'] + 1} bytes")
+                return
+            except Exception as e:
+                last_error = e
+                if attempt < SEGMENT_RETRIES:
+                    self.metrics.count('transfer.segment_retries')
+                    time.sleep(attempt)
+        raise last_error
+
+    def _download_segmented(self, url, part_path, state_path, state, task, hasher):
+        """Dosyayı paralel byte aralıklarıyla .part dosyasına indir"""
+        total_size = state['total_size']
+        if 'segments' not in state:
+            # Tek akıştan kalan kısmı ilk parça say, geri kalanı böl
+            downloaded = state.pop('downloaded', 0)
+            state['segments'] = []
+            if downloaded:
+                state['segments'].append({'start': 0, 'end': downloaded - 1, 'done': downloaded})
+            state['segments'] += self._split_ranges(downloaded, total_size)
+
+        pending = [s for s in state['segments'] if s['start'] + s['done'] <= s['end']]
+        print(f"  ⚡ {len(pending)} parça, {min(self.connections, len(pending))} bağlantı ile indiriliyor")
+
+        # .part dosyasını tam boyutta önceden oluştur (varsa içeriğini koru)
+        with open(part_path, 'ab') as f:
+            f.truncate(total_size)
+
+        lock = threading.Lock()
+        progress_state = {'saved_at': 0}
+        validator = state.get('etag') or state.get('last_modified')
+        task.reset(sum(s['done'] for s in state['segments']), total_size)
+
+        def contiguous():
+            # Dosya başından itibaren kesintisiz yazılmış veri
+            position = 0
+            for s in state['segments']:
+                if s['start'] != position:
+                    break
+                position += s['done']
+                if s['start'] + s['done'] <= s['end']:
+                    break
+            return position
+
+        def progress(segment, offset, chunk):
+            task.update(len(chunk))
+            hasher.update_at(offset, chunk)
+            with lock:
+                segment['done'] += len(chunk)
+                available = contiguous()
+                if time.monotonic() - progress_state['saved_at'] >= 1:
+                    self._save_part_state(state_path, state)
+                    progress_state['saved_at'] = time.monotonic()
+            # Özet sınırı önceden yazılmış parçalara ulaştıysa onları da özetle
+            hasher.catch_up(available)
+
+        if not pending:
+            return
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.connections, len(pending))) as pool:
+                futures = [pool.submit(self._download_segment, url, part_path, segment, validator, progress)
+                           for segment in pending]
+                for future in as_completed(futures):
+                    future.result()
+        finally:
+            with lock:
+                self._save_part_state(state_path, state)
+
+    def _download_single(self, url, part_path, state_path, state, task, hasher):
+        """Dosyayı tek bir akış üzerinden .part dosyasına indir"""
+        resume_from = self._contiguous_bytes(state) if state else 0
+
+        # Referer header'ı ekle
+        headers = {'Referer': self.base_url}
+        if resume_from:
+            headers['Range'] = f'bytes={resume_from}-'
+            validator = state.get('etag') or state.get('last_modified')
+            if validator:
+                headers['If-Range'] = validator
+        response = self.session.get(url, stream=True, headers=headers, timeout=TIMEOUTS['transfer'])
+        # Hata durumunda yanıt kapatılmalı; aksi halde havuzdaki bağlantı geri dönmez
+        try:
+            # 416: kaydedilen konum sunucudaki dosyanın dışında, baştan indirilir
+            if not (resume_from and response.status_code == 416):
+                response.raise_for_status()
+
+            etag = response.headers.get('etag')
+            last_modified = response.headers.get('last-modified')
+            content_range = response.headers.get('content-range', '')
+            resumed = (
+                resume_from
+                and response.status_code == 206
+                and content_range.startswith(f'bytes {resume_from}-')
+                and self._validators_match(state, etag, last_modified)
+            )
+            if resume_from and not resumed:
+                print("  ↺ Sunucudaki dosya değişmiş veya devam desteklenmiyor, baştan indiriliyor")
+                response.close()
+                response = self.session.get(url, stream=True, headers={'Referer': self.base_url}, timeout=TIMEOUTS['transfer'])
+                response.raise_for_status()
+                etag = response.headers.get('etag')
+                last_modified = response.headers.get('last-modified')
+                resume_from = 0
+            elif resumed:
+                print(f"  ↻ {resume_from} bytes'tan devam ediliyor")
+
             # İlk chunk'ı oku ve XML hatası kontrolü yap
             first_chunk = next(response.iter_content(chunk_size=1024), None)
-            if first_chunk:
+            if first_chunk and not resume_from:
                 first_chunk_str = first_chunk.decode('utf-8', errors='ignore')
                 if 'unsupportedRequest' in first_chunk_str or 'FAILED' in first_chunk_str:
                     print(f"\n❌ Bu URL desteklenmiyor: {url}")
+                    response.close()
                     return False
-            
-            # Dosya başlangıcını yaz
-            with open(output_path, 'wb') as f:
-                if first_chunk:
-                    f.write(first_chunk)
-                
+
+            total_match = re.search(r'/(\d+)$', content_range) if resumed else None
+            if total_match:
+                total_size = int(total_match.group(1))
+            else:
                 total_size = int(response.headers.get('content-length', 0))
-                downloaded = len(first_chunk) if first_chunk else 0
-                
-                # Kalan içeriği indir
-                for chunk in response.iter_content(chunk_size=8192):
+        except BaseException:
+            response.close()
+            raise
+
+        state = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'total_size': total_size,
+            'downloaded': resume_from,
+        }
+        saved_at = 0
+
+        # Dosya başlangıcını yaz (devam ediliyorsa sonuna ekle)
+        with response, open(part_path, 'r+b' if resume_from else 'wb') as f:
+            f.seek(resume_from)
+            f.truncate()
+            if first_chunk:
+                f.write(first_chunk)
+
+            # Devam ediliyorsa mevcut kısmı bir kez özetle, sonrası akışta özetlenir
+            hasher.catch_up(resume_from, limit=None)
+            if first_chunk:
+                hasher.update_at(resume_from, first_chunk)
+            
+            downloaded = resume_from + (len(first_chunk) if first_chunk else 0)
+            task.reset(downloaded, total_size)
+
+            # Kalan içeriği indir; bağlantı koparsa da yazılan kısım yan dosyaya kaydedilir
+            try:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
                     if chunk:
+                        self.rate_limiter.consume(len(chunk))
                         f.write(chunk)
+                        hasher.update_at(downloaded, chunk)
                         downloaded += len(chunk)
-                        if total_size > 0:
-                            percent = (downloaded / total_size) * 100
-                            print(f"\r  İlerleme: {percent:.1f}% ({downloaded}/{total_size} bytes)", end='', flush=True)
-                        else:
-                            print(f"\r  İndirilen: {downloaded} bytes", end='', flush=True)
+                        task.update(len(chunk))
+                        if time.monotonic() - saved_at >= 1:
+                            f.flush()
+                            state['downloaded'] = downloaded
+                            self._save_part_state(state_path, state)
+                            saved_at = time.monotonic()
+            finally:
+                f.flush()
+                state['downloaded'] = downloaded
+                self._save_part_state(state_path, state)
+
+        if total_size and downloaded != total_size:
+            raise IOError(f"Boyut uyuşmuyor: {downloaded}/{total_size} bytes")
+        return state
+
+    @timed('sync.check')
+    def is_unchanged(self, url, output_path, manifest):
+        """Dosya tam olarak indirilmiş ve sunucuda değişmemiş mi?
+
+        Manifest kaydı, yerel dosya boyutu ve koşullu istek
+        (If-None-Match / If-Modified-Since) birlikte kontrol edilir.
+        """
+        entry = manifest.get(output_path)
+        if not entry or entry.get('url') != url:
+            return False
+        if not os.path.exists(output_path) or os.path.getsize(output_path) != entry.get('size'):
+            return False
+        return self._remote_unchanged(url, entry)
+
+    def _remote_unchanged(self, url, entry):
+        """Sunucudaki dosya kayıttaki (ETag / Last-Modified / boyut) ile aynı mı?"""
+        info = self.revalidate_url(url, entry)
+        if info is None:
+            return False
+        if entry.get('etag') or info.get('etag'):
+            return info.get('etag') == entry.get('etag') and info.get('size') in (None, entry['size'])
+        if entry.get('last_modified') or info.get('last_modified'):
+            return info.get('last_modified') == entry.get('last_modified') and info.get('size') in (None, entry['size'])
+        return info.get('size') == entry['size']
+
+    def download_file(self, url, output_path, manifest=None, blob_store=None, source_info=None):
+        """Dosyayı indir (mümkünse paralel parçalar halinde, yarım kaldıysa devam ederek)
+
+        Veri önce `<output_path>.part` dosyasına yazılır; ilerleme
+        `<output_path>.part.json` yan dosyasında tutulur. İndirme tamamlanınca
+        .part dosyası atomik olarak asıl adına taşınır ve `manifest` verilmişse
+        dosyanın kaydı güncellenir. `blob_store` verilmişse dosya içerik
+        adresli depoya bağlanır. `source_info` sözlüğü verilmişse indirilen
+        sürümün boyutu ve doğrulayıcıları (ETag / Last-Modified) içine yazılır.
+        """
+        part_path = output_path + '.part'
+        state_path = part_path + '.json'
+        task = self.progress.task(os.path.basename(output_path), url=url)
+        hasher = StreamHasher(part_path)
+        started = time.perf_counter()
+        ok = False
+        try:
+            print(f"📥 İndiriliyor: {url}")
+
+            state = self._load_part_state(state_path, url) if os.path.exists(part_path) else None
+            if state:
+                self.metrics.count('transfer.resumed')
+
+            segmented = False
+            if self.connections > 1 or state:
+                probe = self.probe_ranges(url)
+                if probe is None:
+                    print(f"\n❌ Bu URL desteklenmiyor: {url}")
+                    return False
+
+                if state and not (
+                    probe['accepts_ranges']
+                    and state.get('total_size') == probe['total_size']
+                    and self._validators_match(state, probe['etag'], probe['last_modified'])
+                ):
+                    print("  ↺ Yarım kalan indirme geçersiz, baştan başlanıyor")
+                    state = None
+
+                # Range desteklenmiyorsa ya da dosya küçükse tek akışa dön
+                segmented = (
+                    self.connections > 1
+                    and probe['accepts_ranges']
+                    and probe['total_size'] >= 2 * MIN_SEGMENT_SIZE
+                )
+                if segmented and not state:
+                    state = {
+                        'url': url,
+                        'etag': probe['etag'],
+                        'last_modified': probe['last_modified'],
+                        'total_size': probe['total_size'],
+                    }
+
+            if state and state.get('total_size') and self._contiguous_bytes(state) >= state['total_size']:
+                # Aktarım bitmiş ama taşımadan önce kesilmiş: yalnızca doğrula ve taşı
+                print("  ✓ Yarım kalan dosya zaten tamam, doğrulanıyor")
+                task.reset(state['total_size'], state['total_size'])
+            elif segmented:
+                if state.get('segments') or state.get('downloaded'):
+                    print(f"  ↻ {self._contiguous_bytes(state)}+ bytes'tan devam ediliyor")
+                self._download_segmented(url, part_path, state_path, state, task, hasher)
+            else:
+                state = self._download_single(url, part_path, state_path, state, task, hasher)
+                if not state:
+                    return False
+
+            # Boyut, özet ve kapsayıcı kontrolü
+            file_size = os.path.getsize(part_path)
+            expected_size = state.get('total_size') or None
+            if expected_size and file_size != expected_size:
+                raise IOError(f"Boyut uyuşmuyor: {file_size}/{expected_size} bytes")
+            with self.metrics.phase('transfer.verify'):
+                digest = hasher.hexdigest(file_size)
+                container_ok, container = check_container(part_path)
+            if not container_ok:
+                # Bozuk içerik yerine taşınmaz ve manifest'e girmez; sonraki çalıştırma baştan indirir
+                # (tam .part saklansaydı her çalıştırma aynı dosyayı yeniden doğrulayıp reddederdi)
+                for leftover in (part_path, state_path):
+                    if os.path.exists(leftover):
+                        os.remove(leftover)
+                raise IOError(f"Kapsayıcı kontrolü başarısız ({container})")
+            
+            # Tamamlanan dosyayı atomik olarak yerine taşı
+            os.replace(part_path, output_path)
+            os.remove(state_path)
             
+            write_integrity_sidecar(output_path, {
+                'url': url,
+                'size': file_size,
+                'expected_size': expected_size,
+                'algorithm': hasher.algorithm,
+                'hash': digest,
+                'container': container,
+                'container_ok': container_ok,
+            })
+            if source_info is not None:
+                source_info.update(url=url, size=file_size, etag=state.get('etag'),
+                                   last_modified=state.get('last_modified'))
+            if manifest is not None:
+                manifest.record(output_path, {
+                    'url': url,
+                    'size': file_size,
+                    'etag': state.get('etag'),
+                    'last_modified': state.get('last_modified'),
+                    hasher.algorithm: digest,
+                })
+            if blob_store is not None and blob_store.adopt(output_path, hasher.algorithm, digest):
+                print(f"\n🔗 Aynı içerik depoda mevcut, sabit bağlantı kullanıldı: {output_path}")
+
             # Dosya boyutunu kontrol et
             file_size = os.path.getsize(output_path)
             if file_size < 100:  # 100 byte'dan küçükse muhtemelen hata
                 print(f"\n⚠ Uyarı: Dosya çok küçük ({file_size} bytes), kontrol edin!")
             else:
                 print(f"\n✓ İndirildi: {output_path} ({file_size} bytes)")
-            
+
+            ok = True
             return True
-            
+
         except Exception as e:
             print(f"\n❌ İndirme hatası ({url}): {e}")
+            if os.path.exists(part_path):
+                print(f"💾 Yarım dosya korundu, sonraki çalıştırmada devam edilecek: {part_path}")
             return False
-    
-    def download_all(self, output_dir='downloads'):
-        """Tüm videoları ve ses dosyalarını indir"""
+        finally:
+            task.finish(ok)
+            elapsed = time.perf_counter() - started
+            self.metrics.add_time('transfer', elapsed)
+            self.metrics.transfer(url, output_path, task.transferred, elapsed, ok)
+
+    def _stream_to_pipe(self, url, write_fd):
+        """URL içeriğini sırayla boruya (ffmpeg girdisine) yaz
+
+        Bağlantı koparsa aynı sürüm için (If-Range) kalan kısım istenir;
+        boru kapanırsa (ffmpeg sonlandıysa) hemen vazgeçilir.
+        Dönüş: kaynağın boyut ve doğrulayıcı bilgisi (dict)
+        """
+        task = self.progress.task(os.path.basename(urlparse(url).path), url=url)
+        info = {'url': url, 'size': 0, 'etag': None, 'last_modified': None}
+        started = time.perf_counter()
+        sent = 0
+        ok = False
+        try:
+            with os.fdopen(write_fd, 'wb') as pipe:
+                for attempt in range(1, SEGMENT_RETRIES + 1):
+                    headers = {'Referer': self.base_url}
+                    if sent:
+                        headers['Range'] = f'bytes={sent}-'
+                        validator = info['etag'] or info['last_modified']
+                        if validator:
+                            headers['If-Range'] = validator
+                    try:
+                        with self.session.get(url, stream=True, headers=headers, timeout=TIMEOUTS['transfer']) as response:
+                            response.raise_for_status()
+                            if sent and response.status_code != 206:
+                                raise IOError("Sunucudaki dosya değişmiş veya devam desteklenmiyor")
+                            if not sent:
+                                info['size'] = int(response.headers.get('content-length', 0))
+                                info['etag'] = response.headers.get('etag')
+                                info['last_modified'] = response.headers.get('last-modified')
+                                task.reset(0, info['size'])
+                            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                                if not chunk:
+                                    continue
+                                if not sent and b'unsupportedRequest' in chunk[:1024]:
+                                    raise IOError(f"Bu URL desteklenmiyor: {url}")
+                                self.rate_limiter.consume(len(chunk))
+                                pipe.write(chunk)
+                                sent += len(chunk)
+                                task.update(len(chunk))
+                        if info['size'] and sent < info['size']:
+                            raise IOError(f"Eksik akış: {sent}/{info['size']} bytes")
+                        info['size'] = sent
+                        ok = True
+                        return info
+                    except BrokenPipeError:
+                        raise
+                    except Exception as e:
+                        if attempt == SEGMENT_RETRIES:
+                            raise
+                        print(f"\n  ↻ Akış kesildi ({e}), {sent} bytes'tan devam ediliyor")
+                        self.metrics.count('transfer.stream_retries')
+                        time.sleep(attempt)
+        finally:
+            task.finish(ok)
+            self.metrics.transfer(url, 'pipe', task.transferred, time.perf_counter() - started, ok)
+
+    @timed('mux')
+    def mux_recording(self, video_urls, audio_urls, output_path, manifest=None, blob_store=None,
+                      mux_format=MUX_FORMAT):
+        """Video ve ses akışlarını indirirken ffmpeg ile tek dosyada birleştir
+
+        Akış halinde okunabilen girdiler (webm, ogg ...) ayrı borulardan
+        doğrudan ffmpeg'e verilir, ara dosya yazılmaz; diğerleri önce diske
+        indirilir ve birleştirmeden sonra silinir. Akışlar kopyalanır,
+        yeniden kodlanmaz. Aynı anda en fazla MUX_PROCESSES ffmpeg süreci
+        çalışır.
+        """
+        sources = [('video', url) for url in video_urls] + [('audio', url) for url in audio_urls]
+        part_path = output_path + '.part'
+        inputs = []
+        pipes = []
+        open_fds = []
+        staged = []
+        staged_infos = []
+        ok = False
+        try:
+            print(f"🎬 Birleştiriliyor ({len(sources)} girdi): {output_path}")
+            for i, (kind, url) in enumerate(sources):
+                if is_streamable(url) and os.name == 'posix':
+                    read_fd, write_fd = os.pipe()
+                    open_fds += [read_fd, write_fd]
+                    pipes.append((url, read_fd, write_fd))
+                    inputs.append((kind, f'pipe:{read_fd}'))
+                else:
+                    # Sonda dizin (moov) içeren kapsayıcılar borudan okunamaz
+                    staged_path = f"{output_path}.input{i}{os.path.splitext(urlparse(url).path)[1]}"
+                    staged.append(staged_path)
+                    staged_infos.append({})
+                    if not self.download_file(url, staged_path, source_info=staged_infos[-1]):
+                        return False
+                    inputs.append((kind, staged_path))
+            
+            with _mux_slots:
+                process = subprocess.Popen(
+                    build_mux_command(inputs, part_path, mux_format),
+                    stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                    pass_fds=[read_fd for _, read_fd, _ in pipes],
+                )
+                # Okuma uçları ffmpeg'e geçti; yazma uçlarını akış iş parçacıkları kapatır
+                for _, read_fd, write_fd in pipes:
+                    os.close(read_fd)
+                    open_fds.remove(read_fd)
+                    open_fds.remove(write_fd)
+                
+                with ThreadPoolExecutor(max_workers=max(1, len(pipes))) as pool:
+                    futures = [pool.submit(self._stream_to_pipe, url, write_fd) for url, _, write_fd in pipes]
+                    # Bir akış başarısız olursa yarım çıktı üretmemesi için ffmpeg'i durdur
+                    for future in futures:
+                        future.add_done_callback(lambda f: f.exception() and process.kill())
+                    _, stderr = process.communicate()
+                    errors = [future.exception() for future in futures]
+            
+            # Asıl nedeni bildir: kopan boru, ffmpeg'in ya da başka bir akışın sonlanmasının sonucudur
+            stream_error = next((e for e in errors if e and not isinstance(e, BrokenPipeError)), None)
+            if stream_error:
+                raise stream_error
+            if process.returncode != 0:
+                message = stderr.decode('utf-8', errors='replace').strip().splitlines()
+                raise IOError(f"ffmpeg başarısız ({process.returncode}): {message[-1] if message else ''}")
+            stream_infos = [future.result() for future in futures]
+            
+            container_ok, container = check_container(part_path)
+            if not container_ok:
+                raise IOError(f"Birleştirilen dosya geçersiz ({container})")
+            digest = file_hash(part_path)
+            os.replace(part_path, output_path)
+            file_size = os.path.getsize(output_path)
+            
+            # Kaynak kayıtları girdi sırasıyla: borudan gelenler akıştan, diğerleri indirmeden
+            streamed, downloaded = iter(stream_infos), iter(staged_infos)
+            source_infos = [next(streamed) if source.startswith('pipe:') else next(downloaded)
+                            for _, source in inputs]
+            write_integrity_sidecar(output_path, {
+                'sources': [url for _, url in sources],
+                'size': file_size,
+                'algorithm': HASH_ALGORITHM,
+                'hash': digest,
+                'container': container,
+                'container_ok': container_ok,
+            })
+            if manifest is not None:
+                manifest.record(output_path, {
+                    'sources': source_infos,
+                    'size': file_size,
+                    HASH_ALGORITHM: digest,
+                })
+            if blob_store is not None and blob_store.adopt(output_path, HASH_ALGORITHM, digest):
+                print(f"\n🔗 Aynı içerik depoda mevcut, sabit bağlantı kullanıldı: {output_path}")
+            print(f"\n✓ Birleştirildi: {output_path} ({file_size} bytes)")
+            ok = True
+            return True
+        
+        except Exception as e:
+            print(f"\n❌ Birleştirme hatası ({output_path}): {e}")
+            return False
+        finally:
+            for fd in open_fds:
+                os.close(fd)
+            for path in staged:
+                for leftover in (path, path + INTEGRITY_SUFFIX):
+                    if os.path.exists(leftover):
+                        os.remove(leftover)
+            if not ok and os.path.exists(part_path):
+                os.remove(part_path)
+
+    def is_mux_unchanged(self, urls, output_path, manifest):
+        """Birleştirilmiş dosya tam ve tüm kaynakları sunucuda değişmemiş mi?"""
+        entry = manifest.get(output_path)
+        if not entry or [source['url'] for source in entry.get('sources', [])] != urls:
+            return False
+        if not os.path.exists(output_path) or os.path.getsize(output_path) != entry.get('size'):
+            return False
+        return all(
+            'size' in source and self._remote_unchanged(source['url'], source)
+            for source in entry['sources']
+        )
+
+    def download_all(self, output_dir='downloads', sync=False, name_template=NAME_TEMPLATE, blob_store=None,
+                     mux=False, mux_format=MUX_FORMAT):
+        """Tüm videoları ve ses dosyalarını indir
+
+        Dosya adları `name_template` şablonundan (kayıt kimliği ve tarih ile)
+        üretilir. İndirilen dosyalar `<output_dir>/manifest.json` içine
+        kaydedilir ve içerik adresli depoya (`blob_store`, verilmezse
+        `<output_dir>/.blobs`) bağlanır. `sync=True` ise manifest'e göre tam
+        ve sunucuda değişmemiş dosyalar yeniden indirilmez. `mux=True` ise
+        video ve ses ayrı dosyalar yerine indirilirken tek dosyada
+        birleştirilir (ffmpeg gerekir, yoksa ayrı indirilir).
+
+        Dönüş: kayıt için sonuç özeti (dict)
+        """
+        started = time.monotonic()
+        result = {
+            'url': self.base_url,
+            'recording_id': recording_id_from_url(self.base_url),
+            'output_dir': output_dir,
+            'status': 'ok',
+            'files': [],
+        }
+        
         # Çıktı dizinini oluştur
-        Path(output_dir).mkdir(exist_ok=True)
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        manifest = SyncManifest(output_dir)
+        if blob_store is None:
+            blob_store = BlobStore(os.path.join(output_dir, BLOB_DIR_NAME))
         
         print(f"🔍 Sunum verileri alınıyor...")
         video_urls, audio_urls = self.get_presentation_data()
@@ -460,57 +3062,422 @@ class VideoDownloader:
             print("❌ Video veya ses dosyası bulunamadı!")
             print("💡 Manuel olarak video URL'lerini kontrol edin:")
             print(f"   {self.base_url}/presentation/")
-            return
+            result['status'] = 'not_found'
+            result['elapsed'] = round(time.monotonic() - started, 2)
+            return result
         
         print(f"\n📹 {len(video_urls)} video dosyası bulundu")
         print(f"🎵 {len(audio_urls)} ses dosyası bulundu\n")
         
-        # Videoları indir
-        for i, url in enumerate(video_urls, 1):
-            filename = url.split('/')[-1] or f"video_{i}.webm"
-            output_path = os.path.join(output_dir, filename)
-            self.download_file(url, output_path)
+        if mux and not ffmpeg_available():
+            print(f"⚠ {FFMPEG_BINARY} bulunamadı, dosyalar ayrı ayrı indirilecek")
+            mux = False
+        if mux and video_urls and len(video_urls) + len(audio_urls) > 1:
+            return self._download_merged(result, video_urls, audio_urls, output_dir, sync, name_template,
+                                         manifest, blob_store, mux_format, started)
         
-        # Ses dosyalarını indir
-        for i, url in enumerate(audio_urls, 1):
-            filename = url.split('/')[-1] or f"audio_{i}.ogg"
+        jobs = [('video', i, url) for i, url in enumerate(video_urls, 1)]
+        jobs += [('audio', i, url) for i, url in enumerate(audio_urls, 1)]
+        
+        # Boyutlar önceliklendirme için (yoklama önbelleğinden ya da paralel HEAD ile)
+        sizes = self.probe_candidates(video_urls + audio_urls)
+        
+        # Aktarımlar zamanlayıcıda ses önce, küçük dosya önce sırasıyla çalışır
+        scheduler = self.scheduler or TransferScheduler()
+        transfers = []
+        for kind, i, url in jobs:
+            default_name = f"video_{i}.webm" if kind == 'video' else f"audio_{i}.ogg"
+            filename = format_output_name(name_template, result['recording_id'], kind, i,
+                                          url.split('/')[-1] or default_name)
             output_path = os.path.join(output_dir, filename)
-            self.download_file(url, output_path)
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            
+            # Eşitleme modunda değişmemiş dosyaları atla
+            if sync and self.is_unchanged(url, output_path, manifest):
+                print(f"⏭ Değişmemiş, atlandı: {output_path}")
+                result['files'].append({'kind': kind, 'url': url, 'path': output_path, 'ok': True, 'skipped': True})
+                continue
+            
+            size = (sizes.get(url) or {}).get('size')
+            entry = {'kind': kind, 'url': url, 'path': output_path, 'ok': False}
+            result['files'].append(entry)
+            transfers.append((entry, (kind, size, self.download_file, (url, output_path),
+                                      {'manifest': manifest, 'blob_store': blob_store})))
+        
+        futures = scheduler.submit_many([job for _, job in transfers])
+        for (entry, _), future in zip(transfers, futures):
+            try:
+                entry['ok'] = future.result()
+            except Exception as e:
+                entry['error'] = str(e)
+        if scheduler is not self.scheduler:
+            scheduler.close()
+        
+        if not all(f['ok'] for f in result['files']):
+            result['status'] = 'partial' if any(f['ok'] for f in result['files']) else 'failed'
+        result['elapsed'] = round(time.monotonic() - started, 2)
         
         print(f"\n✅ Tüm dosyalar indirildi: {output_dir}/")
+        return result
+
+    def _download_merged(self, result, video_urls, audio_urls, output_dir, sync, name_template,
+                         manifest, blob_store, mux_format, started):
+        """download_all'un birleştirme kolu: kaydı tek dosya olarak indir"""
+        urls = video_urls + audio_urls
+        filename = format_output_name(name_template, result['recording_id'], 'merged', 1, f'merged.{mux_format}')
+        output_path = os.path.join(output_dir, filename)
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        entry = {'kind': 'merged', 'sources': urls, 'path': output_path, 'ok': False}
+        result['files'].append(entry)
+        
+        if sync and self.is_mux_unchanged(urls, output_path, manifest):
+            print(f"⏭ Değişmemiş, atlandı: {output_path}")
+            entry.update(ok=True, skipped=True)
+        else:
+            # Birleştirme tek aktarım olarak zamanlayıcıdan geçer
+            sizes = self.probe_candidates(urls)
+            size = sum((sizes.get(url) or {}).get('size') or 0 for url in urls) or None
+            scheduler = self.scheduler or TransferScheduler()
+            future, = scheduler.submit_many([
+                ('video', size, self.mux_recording, (video_urls, audio_urls, output_path),
+                 {'manifest': manifest, 'blob_store': blob_store, 'mux_format': mux_format})
+            ])
+            try:
+                entry['ok'] = future.result()
+            except Exception as e:
+                entry['error'] = str(e)
+            if scheduler is not self.scheduler:
+                scheduler.close()
+        
+        if not entry['ok']:
+            result['status'] = 'failed'
+        result['elapsed'] = round(time.monotonic() - started, 2)
+        if entry['ok']:
+            print(f"\n✅ Kayıt tek dosya olarak hazır: {output_path}")
+        return result
 
 
-def main():
-    # KULLANICI AYARLARI - Buraya kullanıcı adı ve şifrenizi girin
-    USERNAME = ""  # Buraya kullanıcı adınızı yazın
-    PASSWORD = ""          # Buraya şifrenizi yazın
+def read_url_list(source):
+    """Dosyadan veya stdin'den ('-') playback URL listesini oku
+
+    Boş satırlar ve '#' ile başlayan satırlar atlanır, tekrarlar kaldırılır.
+    """
+    if source == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
     
-    # Video URL'i
-    VIDEO_URL = "https://uzemload2025-2026.gidatarim.edu.tr/playback/presentation/2.3/2eef81719994f86c8cfe36f849b031b0dd982824-1759406163000"
+    urls = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith('#') and line not in urls:
+            urls.append(line)
+    return urls
+
+
+def run_batch(urls, username=None, password=None, output_dir='downloads',
+              workers=DEFAULT_BATCH_WORKERS, host_connections=DEFAULT_HOST_CONNECTIONS,
+              connections=DEFAULT_CONNECTIONS, sync=False, transfers=DEFAULT_TRANSFERS,
+              bandwidth_limit=BANDWIDTH_LIMIT, mux=False, mux_format=MUX_FORMAT, discovery=None, use_browser=True, use_cache=True,
+              save_html=False):
+    """Birden fazla kaydı aynı anda indir
+
+    Her sunucu için tek bir oturum açılır ve tüm kayıtlar bu oturumu paylaşır;
+    oturumun bağlantı havuzu sunucu başına bağlantı sınırını uygular. Her kayıt
+    kendi alt dizinine (`<output_dir>/<kayıt_id>/`) indirilir ve sonuç özeti
+    `<output_dir>/batch_summary.json` dosyasına yazılır. Selenium gereken
+    kayıtlar, iş parçacığı sayısı kadar tarayıcıdan oluşan ortak havuzu kullanır.
+    Tüm kayıtların aktarımları tek bir öncelikli zamanlayıcıdan ve ortak bant
+    genişliği sınırından geçer. `mux=True` ise her kayıt tek dosyada
+    birleştirilir; ffmpeg süreçlerinin sayısı MUX_PROCESSES ile sınırlıdır.
+    `save_html=True` ise taranan oynatıcı sayfası kaydın dizinine yazılır.
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    # Çıktı dizini
-    OUTPUT_DIR = "downloads"
+    # Sunucu başına bir kez oturum aç
+    sessions = {}
+    for url in urls:
+        host = urlparse(url).netloc
+        if host not in sessions:
+            print(f"🔐 Oturum hazırlanıyor: {host}")
+            session = create_session(url, host_connections)
+            if username and password:
+                VideoDownloader(url, username, password, session=session).login()
+            sessions[host] = session
     
-    print("=" * 60)
-    print("📹 Okul Video İndirici")
-    print("=" * 60)
-    print(f"URL: {VIDEO_URL}\n")
+    use_browser = use_browser and discovery in (None, 'selenium') and selenium_available()
+    browser_pool = BrowserPool(size=max(1, workers)) if use_browser else None
+    # Kayıtlar arasında ortak içerik adresli depo
+    blob_store = BlobStore(os.path.join(output_dir, BLOB_DIR_NAME))
+    scheduler = TransferScheduler(transfers)
+    if bandwidth_limit:
+        set_bandwidth_limit(bandwidth_limit)
     
-    # İndiriciyi oluştur
-    downloader = VideoDownloader(
-        base_url=VIDEO_URL,
-        username=USERNAME if USERNAME != "kullanici_adi" else None,
-        password=PASSWORD if PASSWORD != "sifre" else None
-    )
+    def process(url):
+        recording_dir = os.path.join(output_dir, recording_id_from_url(url))
+        downloader = VideoDownloader(url, username, password, connections=connections,
+                                     session=sessions[urlparse(url).netloc], browser_pool=browser_pool,
+                                     scheduler=scheduler, discovery=discovery, use_browser=use_browser,
+                                     use_cache=use_cache, debug_dir=recording_dir if save_html else None)
+        try:
+            return downloader.download_all(output_dir=recording_dir, sync=sync, blob_store=blob_store,
+                                           mux=mux, mux_format=mux_format)
+        except Exception as e:
+            return {'url': url, 'recording_id': recording_id_from_url(url),
+                    'output_dir': recording_dir, 'status': 'error', 'error': str(e), 'files': []}
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [pool.submit(process, url) for url in urls]
+            results = [future.result() for future in futures]
+    finally:
+        scheduler.close()
+        if browser_pool is not None:
+            browser_pool.close()
     
-    # İndirmeyi başlat
-    downloader.download_all(output_dir=OUTPUT_DIR)
+    # Sonuçları giriş sırasıyla özet dosyasına yaz
+    summary_path = os.path.join(output_dir, 'batch_summary.json')
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
     
     print("\n" + "=" * 60)
-    print("✨ İşlem tamamlandı!")
+    print("📋 Toplu indirme özeti")
     print("=" * 60)
+    for r in results:
+        icon = '✓' if r['status'] == 'ok' else '⚠' if r['status'] == 'partial' else '❌'
+        ok_count = sum(1 for f in r['files'] if f['ok'])
+        print(f"{icon} {r['recording_id']}: {r['status']} ({ok_count}/{len(r['files'])} dosya)")
+    for host, session in sessions.items():
+        print(f"🔌 {host}: {session.transport_stats.summary()}")
+    print(f"💾 Özet kaydedildi: {summary_path}")
+    return results
 
 
-if __name__ == "__main__":
-    main()
+def run_probe(url, username=None, password=None, discovery=None, use_browser=True, use_cache=True, debug_dir=None):
+    """Kaydı indirmeden keşfet ve bulunan dosyaları boyutlarıyla listele
+
+    Dönüş: en az bir dosya bulunduysa True
+    """
+    downloader = VideoDownloader(url, username, password, use_cache=use_cache,
+                                 discovery=discovery, use_browser=use_browser, debug_dir=debug_dir)
+    video_urls, audio_urls = downloader.get_presentation_data()
+    infos = downloader.probe_candidates(video_urls + audio_urls)
+    
+    print("\n" + "=" * 60)
+    print(f"🔎 {recording_id_from_url(url)}: {len(video_urls)} video, {len(audio_urls)} ses")
+    print("=" * 60)
+    for kind, urls in (('📹', video_urls), ('🎵', audio_urls)):
+        for media_url in urls:
+            size = (infos.get(media_url) or {}).get('size')
+            print(f"{kind} {media_url} ({format_bytes(size) if size else 'boyut bilinmiyor'})")
+    return bool(video_urls or audio_urls)
+
+
+def parse_rate(value):
+    """'20M', '512K', '1.5G' gibi hız değerlerini byte/s'ye çevir"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?)(?:i?B)?(?:/s)?\s*', value, re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(f"geçersiz hız: {value!r} (ör. 512K, 20M)")
+    multiplier = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}[match.group(2).upper()]
+    return int(float(match.group(1)) * multiplier)
+
+
+CLI_COMMANDS = ('download', 'batch', 'probe', 'verify')
+
+
+def build_parser():
+    """Komut satırı ayrıştırıcısı (download / batch / probe / verify)"""
+    parser = argparse.ArgumentParser(
+        prog='download_video.py',
+        description='BigBlueButton sunum kayıtlarını indirir.',
+    )
+    # add_subparsers(required=...) Python 3.7 gerektirir
+    commands = parser.add_subparsers(dest='command', metavar='KOMUT')
+    commands.required = True
+    
+    # Keşif ve oturum seçenekleri (download, batch, probe)
+    discovery = argparse.ArgumentParser(add_help=False)
+    discovery.add_argument('-u', '--username', default=os.environ.get('OKUL_VIDEO_USERNAME'),
+                           help='kullanıcı adı (varsayılan: $OKUL_VIDEO_USERNAME)')
+    discovery.add_argument('-p', '--password', default=os.environ.get('OKUL_VIDEO_PASSWORD'),
+                           help='şifre (varsayılan: $OKUL_VIDEO_PASSWORD)')
+    discovery.add_argument('--discovery', choices=DISCOVERY_STRATEGIES,
+                           help='yalnızca bu keşif stratejisini kullan, önbelleği atla (varsayılan: sırayla hepsi)')
+    discovery.add_argument('--no-browser', dest='use_browser', action='store_false',
+                           help='Selenium/Chrome kullanma')
+    discovery.add_argument('--no-cache', dest='use_cache', action='store_false',
+                           help='keşif önbelleğini kullanma')
+    discovery.add_argument('--save-html', action='store_true',
+                           help=f'HTML taramasında oynatıcı sayfasını {DEBUG_HTML_FILENAME} olarak kaydet '
+                                '(çıktı dizinine; probe için çalışma dizinine)')
+    
+    # Aktarım seçenekleri (download, batch)
+    transfer = argparse.ArgumentParser(add_help=False)
+    transfer.add_argument('-o', '--output', default='downloads', help='çıktı dizini (varsayılan: downloads)')
+    transfer.add_argument('-c', '--connections', type=int, default=DEFAULT_CONNECTIONS,
+                          help=f'dosya başına paralel bağlantı (varsayılan: {DEFAULT_CONNECTIONS})')
+    transfer.add_argument('--transfers', type=int, default=DEFAULT_TRANSFERS,
+                          help=f'aynı anda aktarılan dosya (varsayılan: {DEFAULT_TRANSFERS})')
+    transfer.add_argument('--max-bandwidth', type=parse_rate, default=BANDWIDTH_LIMIT,
+                          help='toplam bant genişliği sınırı, ör. 20M (varsayılan: sınırsız)')
+    transfer.add_argument('--bw-limit-file', metavar='DOSYA',
+                          help='bant genişliği sınırını bu dosyadan oku; dosya değişince ya da SIGHUP '
+                               'alınca çalışırken güncellenir (ör. echo 5M > DOSYA)')
+    transfer.add_argument('--sync', action='store_true',
+                          help='manifest\'e göre değişmemiş dosyaları yeniden indirme')
+    transfer.add_argument('--mux', action='store_true',
+                          help='video ve sesi indirirken tek dosyada birleştir (ffmpeg gerekir)')
+    transfer.add_argument('--mux-format', choices=sorted(MUX_CONTAINERS), default=MUX_FORMAT,
+                          help=f'birleştirilmiş dosya biçimi (varsayılan: {MUX_FORMAT})')
+    transfer.add_argument('--progress-json-fd', type=int, metavar='FD',
+                          help='ilerleme olaylarını JSON satırları olarak bu dosya tanımlayıcısına yaz')
+    
+    # Ölçüm ve profil seçenekleri (download, batch, probe)
+    instrumentation = argparse.ArgumentParser(add_help=False)
+    instrumentation.add_argument('--metrics-json', metavar='DOSYA',
+                                 help=f'çalıştırma ölçüm raporu (varsayılan: <çıktı dizini>/{METRICS_FILENAME})')
+    instrumentation.add_argument('--metrics-prom', metavar='DOSYA',
+                                 help='ölçümleri Prometheus textfile olarak yaz (node exporter)')
+    instrumentation.add_argument('--profile', metavar='DOSYA',
+                                 help='cProfile ile çalıştır ve sonuçları bu dosyaya yaz (.prof)')
+    
+    download = commands.add_parser('download', parents=[discovery, transfer, instrumentation],
+                                   help='tek bir kaydı indir')
+    download.add_argument('url', help='playback URL\'i')
+    
+    batch = commands.add_parser('batch', parents=[discovery, transfer, instrumentation],
+                                help='birden fazla kaydı indir')
+    batch.add_argument('source', help='her satırda bir URL içeren dosya (- ise stdin)')
+    batch.add_argument('--workers', type=int, default=DEFAULT_BATCH_WORKERS,
+                       help=f'aynı anda işlenen kayıt (varsayılan: {DEFAULT_BATCH_WORKERS})')
+    batch.add_argument('--host-connections', type=int, default=DEFAULT_HOST_CONNECTIONS,
+                       help=f'sunucu başına en fazla bağlantı (varsayılan: {DEFAULT_HOST_CONNECTIONS})')
+    
+    probe = commands.add_parser('probe', parents=[discovery, instrumentation],
+                                help='indirmeden dosyaları bul ve listele')
+    probe.add_argument('url', help='playback URL\'i')
+    
+    verify = commands.add_parser('verify', help='indirilmiş arşivi doğrula')
+    verify.add_argument('directory', nargs='?', default='downloads', help='arşiv dizini (varsayılan: downloads)')
+    verify.add_argument('--workers', type=int, help='paralel süreç sayısı (varsayılan: çekirdek sayısı)')
+    return parser
+
 
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Eski kullanım: `download_video.py <url>` veya `download_video.py urls.txt`
+    if argv and argv[0] not in CLI_COMMANDS and not argv[0].startswith('-'):
+        argv.insert(0, 'download' if argv[0].startswith(('http://', 'https://')) else 'batch')
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'discovery', None) == 'selenium' and not args.use_browser:
+        parser.error("--discovery selenium ile --no-browser birlikte kullanılamaz")
+    
+    if args.command == 'verify':
+        results = verify_archive(args.directory, workers=args.workers)
+        return 0 if all(r['ok'] for r in results) else 1
+    
+    profiler = Profiler() if args.profile else None
+    if profiler is not None:
+        profiler.start()
+    try:
+        return run_command(args)
+    finally:
+        if profiler is not None:
+            print(profiler.stop(args.profile))
+            print(f"🧪 Profil kaydedildi: {args.profile} (ör. python -m pstats {args.profile})")
+        write_run_metrics(get_metrics(), args)
+
+
+def write_run_metrics(metrics, args):
+    """Çalıştırmanın ölçüm raporunu JSON (ve istenirse Prometheus) olarak yaz"""
+    json_path = args.metrics_json
+    if json_path is None and getattr(args, 'output', None):
+        json_path = os.path.join(args.output, METRICS_FILENAME)
+    print(f"⏱ Aşamalar: {metrics.summary()}")
+    try:
+        if json_path:
+            metrics.write_json(json_path)
+            print(f"📊 Ölçüm raporu: {json_path}")
+        if args.metrics_prom:
+            metrics.write_prometheus(args.metrics_prom)
+            print(f"📊 Prometheus ölçümleri: {args.metrics_prom}")
+    except OSError as e:
+        print(f"⚠ Ölçüm raporu yazılamadı: {e}")
+
+
+def run_command(args):
+    """download / batch / probe komutunu çalıştır; dönüş çıkış kodu"""
+    if args.command == 'probe':
+        found = run_probe(args.url, args.username, args.password, discovery=args.discovery,
+                          use_browser=args.use_browser, use_cache=args.use_cache,
+                          debug_dir='.' if args.save_html else None)
+        return 0 if found else 1
+    
+    if args.max_bandwidth:
+        set_bandwidth_limit(args.max_bandwidth)
+    if args.progress_json_fd is not None:
+        configure_progress(json_fd=args.progress_json_fd)
+    
+    # Sınır dosyası verilmişse --max-bandwidth başlangıç değeridir, dosyadaki değer onu geçersiz kılar
+    with BandwidthLimitWatcher(args.bw_limit_file):
+        if args.command == 'batch':
+            urls = read_url_list(args.source)
+            print("=" * 60)
+            print(f"📹 Okul Video İndirici - toplu mod ({len(urls)} kayıt)")
+            print("=" * 60)
+            results = run_batch(
+                urls,
+                username=args.username,
+                password=args.password,
+                output_dir=args.output,
+                workers=args.workers,
+                host_connections=args.host_connections,
+                connections=args.connections,
+                sync=args.sync,
+                transfers=args.transfers,
+                mux=args.mux,
+                mux_format=args.mux_format,
+                discovery=args.discovery,
+                use_browser=args.use_browser,
+                use_cache=args.use_cache,
+                save_html=args.save_html,
+            )
+            return 0 if all(r['status'] == 'ok' for r in results) else 1
+    
+        print("=" * 60)
+        print("📹 Okul Video İndirici")
+        print("=" * 60)
+        print(f"URL: {args.url}\n")
+    
+        # İndiriciyi oluştur
+        scheduler = TransferScheduler(args.transfers)
+        downloader = VideoDownloader(
+            base_url=args.url,
+            username=args.username,
+            password=args.password,
+            connections=args.connections,
+            use_cache=args.use_cache,
+            scheduler=scheduler,
+            discovery=args.discovery,
+            use_browser=args.use_browser,
+            debug_dir=args.output if args.save_html else None,
+        )
+    
+        # İndirmeyi başlat
+        try:
+            result = downloader.download_all(output_dir=args.output, sync=args.sync,
+                                             mux=args.mux, mux_format=args.mux_format)
+        finally:
+            scheduler.close()
+        print(f"🔌 Bağlantı: {downloader.session.transport_stats.summary()}")
+    
+        print("\n" + "=" * 60)
+        print("✨ İşlem tamamlandı!")
+        print("=" * 60)
+        return 0 if result['status'] == 'ok' else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())